@@ -1 +1,5 @@
-from .game import Environment
+from .game import Environment, astep_many
+from .vector import VectorEnvironment
+from .batch import BatchEnvironment
+from .recording import Recording, Replayer
+from .trajectory import TrajectoryWriter, TrajectoryReader
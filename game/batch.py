@@ -0,0 +1,67 @@
+from typing import Tuple
+import numpy as np
+import gym
+from .engine import Engine, BatchEngine
+
+
+class BatchEnvironment:
+    """ num_games games stepped in lockstep by one BatchEngine in this process, see BatchEngine for the rules covered.
+
+    Observations are the 'entities' observations of Environment stacked per game, rewards follow Environment.step.
+    Finished games are reset automatically, the observation returned for that step is the first one of the next game.
+    """
+
+    def __init__(self,
+                 num_games: int,
+                 level: int = 1,
+                 lives: int = 3,
+                 config_path: str = None,
+                 godmode: bool = False,
+                 always_move: bool = False,
+                 max_entities: int = 256,
+                 seed: int = None):
+        self.num_games = num_games
+        self.engine = BatchEngine(num_games, start_level=level, lives=lives, config_path=config_path,
+                                  godmode=godmode, seed=seed)
+
+        self.action_mod = 1 if always_move else 0
+        self.actions = 8 if always_move else 9
+        self.single_action_space = gym.spaces.Discrete(self.actions * self.actions)
+        self.action_space = gym.spaces.MultiDiscrete([self.single_action_space.n] * num_games)
+        self.single_observation_space = gym.spaces.Box(low=-np.inf, high=np.inf, dtype=np.float32,
+                                                       shape=(max_entities, len(Engine.ENTITY_FEATURES)))
+        self.observation_space = gym.vector.utils.batch_space(self.single_observation_space, num_games)
+
+        self.scores = np.zeros(num_games, dtype=np.int64)
+        self.observations = np.zeros(self.observation_space.shape, dtype=np.float32)
+
+    def reset(self, seed: int = None) -> np.ndarray:
+
+        self.engine.reset(seed=seed)
+        self.scores[:] = 0
+        return self.engine.get_entity_data(self.observations).copy()
+
+    def step(self, actions: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, dict]:
+
+        actions = np.asarray(actions)
+        if actions.shape != (self.num_games,):
+            raise ValueError(f'Expected {self.num_games} actions, got shape {actions.shape}.')
+        if ((actions < 0) | (actions >= self.single_action_space.n)).any():
+            raise ValueError(f'Actions {actions} are invalid.')
+
+        engine = self.engine
+        engine.handle_input(actions // self.actions + self.action_mod, actions % self.actions + self.action_mod)
+        engine.tick()
+
+        rewards = ((engine.score - self.scores) / 100.0).astype(np.float32)
+        self.scores[:] = engine.score
+        dones = engine.done.copy()
+        rewards[dones] = -1
+        infos = engine.get_infos()
+
+        finished = np.flatnonzero(dones)
+        if len(finished):
+            engine.reset(finished)
+            self.scores[finished] = 0
+
+        return engine.get_entity_data(self.observations).copy(), rewards, dones, infos
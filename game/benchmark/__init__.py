@@ -0,0 +1 @@
+from .benchmark import run_wave, run_benchmark, compare, BASELINE_PATH, POLICIES
@@ -0,0 +1,70 @@
+import argparse
+import json
+import sys
+from .benchmark import run_benchmark, compare, BASELINE_PATH, POLICIES
+
+
+def print_results(results: dict):
+
+    print(f"{'wave':>4} {'policy':>8} {'steps/s':>9} {'step p50':>9} {'p99':>7} {'sim p50':>8} {'draw p50':>9} "
+          f"{'read p50':>9} {'reset p50':>10} {'engine':>8}")
+    for result in results['results']:
+        print(f"{result['wave']:>4} {result['policy']:>8} {result['steps_per_sec']:>9.1f} "
+              f"{result['step_p50_ms']:>9.3f} {result['step_p99_ms']:>7.3f} {result['sim_p50_ms']:>8.3f} "
+              f"{result['draw_p50_ms']:>9.3f} {result['readback_p50_ms']:>9.3f} {result['reset_p50_ms']:>10.3f} "
+              f"{result['construct_p50_ms']:>8.1f}")
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description='Headless throughput of every wave, latencies in milliseconds.')
+    parser.add_argument('--waves', type=int, nargs='+', default=None, help='Waves to run (default all)')
+    parser.add_argument('--policies', nargs='+', default=list(POLICIES), choices=list(POLICIES), help='Policies')
+    parser.add_argument('--steps', type=int, default=1000, help='Measured steps per wave and policy')
+    parser.add_argument('--warmup', type=int, default=50, help='Unmeasured steps before those')
+    parser.add_argument('--resets', type=int, default=20, help='Measured resets per wave and policy')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the games and the random policy')
+    parser.add_argument('--frame-skip', type=int, default=1, help='Environment frame_skip')
+    parser.add_argument('--observation', default='pixels', choices=['pixels', 'entities'], help='Observation type')
+    parser.add_argument('--turbo', action='store_true', help='Run the engines in turbo mode')
+    parser.add_argument('--output', default=None, help='Write the results as JSON to this file')
+    parser.add_argument('--baseline', default=BASELINE_PATH,
+                        help="JSON results to compare against (default the committed baseline, '' for none)")
+    parser.add_argument('--tolerance', type=float, default=0.1, help='Allowed slowdown of throughput and step medians')
+    parser.add_argument('--tail-tolerance', type=float, default=0.5, help='Allowed slowdown of p99s, resets and constructions')
+    args = parser.parse_args()
+
+    results = run_benchmark(args.waves, args.policies, steps=args.steps, warmup=args.warmup, resets=args.resets,
+                            seed=args.seed, frame_skip=args.frame_skip, observation_type=args.observation,
+                            turbo=args.turbo)
+    print_results(results)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        # Timings from other options or another machine say little about this run, so they never fail it.
+        comparable = True
+        if baseline['options'] != results['options']:
+            print(f"Warning!  The baseline ran with other options: {baseline['options']}")
+            comparable = False
+        if baseline['machine'] != results['machine']:
+            print(f"Warning!  The baseline ran on another machine: {baseline['machine']}")
+            comparable = False
+        regressions = compare(results, baseline, args.tolerance, args.tail_tolerance)
+        for regression in regressions:
+            print(f'Regression: {regression}')
+        if regressions and comparable:
+            sys.exit(1)
+        if regressions:
+            print('Not failing on regressions against a baseline from another setup, write one of your own with '
+                  '--output and pass it as --baseline.')
+        else:
+            print('No regressions against the baseline.')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+import os
+import platform
+import time
+from typing import Callable, Dict, List, Sequence
+import numpy as np
+import pygame
+from ..engine import Engine
+from ..game import Environment
+
+
+# Metrics where a larger value is better, every other metric is a latency.
+THROUGHPUT_METRICS = ['steps_per_sec']
+# Results of the default options committed as the reference, see compare().
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+
+def random_policy(env: Environment, seed: int) -> Callable[[int], int]:
+
+    generator = np.random.default_rng(seed)
+    return lambda step: int(generator.integers(env.action_space.n))
+
+
+def sweep_policy(env: Environment, seed: int) -> Callable[[int], int]:
+    """ Scripted: turn the shooting direction every step and the walking direction every 20 steps. """
+
+    offset = 1 - env.action_mod
+    return lambda step: ((step // 20 + seed) % 8 + offset) * env.actions + (step % 8 + offset)
+
+
+POLICIES = {'random': random_policy, 'sweep': sweep_policy}
+
+
+def _percentiles(name: str, seconds: Sequence[float]) -> Dict[str, float]:
+
+    (p50, p99) = np.percentile(np.asarray(seconds) * 1000, [50, 99]).tolist()
+    return {f'{name}_p50_ms': p50, f'{name}_p99_ms': p99}
+
+
+def run_wave(wave: int,
+             policy: str = 'random',
+             steps: int = 1000,
+             warmup: int = 50,
+             resets: int = 20,
+             constructions: int = 3,
+             seed: int = 0,
+             **env_kwargs) -> Dict[str, float]:
+    """ Measure one wave (1-based) with one policy, every latency in milliseconds. """
+
+    construct = []
+    for _ in range(constructions):
+        start = time.perf_counter()
+        Engine(start_level=wave, headless=True, render_policy='on_demand', config_path=env_kwargs.get('config_path'),
+               turbo=env_kwargs.get('turbo', False))
+        construct.append(time.perf_counter() - start)
+
+    env = Environment(level=wave, headless=True, seed=seed, **env_kwargs)
+    # The engine profiler splits step time into draw, readback (without the draws a read has to make) and the rest.
+    profiler = env.engine.enable_profiler(['draw', 'readback'])
+
+    reset = []
+    for index in range(resets):
+        start = time.perf_counter()
+        env.reset(seed=seed + index)
+        reset.append(time.perf_counter() - start)
+
+    env.reset(seed=seed)
+    act = POLICIES[policy](env, seed)
+    total, draw, readback = [], [], []
+    episodes = 0
+    for step in range(warmup + steps):
+        action = act(step)
+        phases = (profiler.phase_times['draw'], profiler.phase_self_times['readback'])
+        start = time.perf_counter()
+        (_, _, done, _) = env.step(action)
+        elapsed = time.perf_counter() - start
+        if step >= warmup:
+            total.append(elapsed)
+            draw.append(profiler.phase_times['draw'] - phases[0])
+            readback.append(profiler.phase_self_times['readback'] - phases[1])
+        if done:
+            episodes += 1
+            env.reset()
+    env.close()
+
+    total = np.asarray(total)
+    sim = total - np.asarray(draw) - np.asarray(readback)
+    result = {'wave': wave, 'policy': policy, 'steps': steps, 'episodes': episodes,
+              'steps_per_sec': steps / total.sum()}
+    for name, seconds in [('step', total), ('sim', sim), ('draw', draw), ('readback', readback), ('reset', reset),
+                          ('construct', construct)]:
+        result.update(_percentiles(name, seconds))
+    return result
+
+
+def run_benchmark(waves: Sequence[int] = None, policies: Sequence[str] = ('random', 'sweep'), **kwargs) -> dict:
+    """ Run every wave of config.yaml (or the given ones) with every policy, see run_wave() for the options. """
+
+    if waves is None:
+        waves = range(1, len(Engine(headless=True, render_policy='never').waves) + 1)
+
+    results = []
+    for wave in waves:
+        for policy in policies:
+            results.append(run_wave(wave, policy, **kwargs))
+
+    return {
+        'machine': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pygame': pygame.version.ver,
+            'platform': platform.platform(),
+            'processor': platform.processor(),
+        },
+        'options': {key: value for key, value in kwargs.items() if isinstance(value, (int, float, str, bool, list))},
+        'results': results,
+    }
+
+
+def compare(current: dict, baseline: dict, tolerance: float = 0.1, tail_tolerance: float = 0.5) -> List[str]:
+    """ Regressions against a baseline run, one line each, for waves both runs measured.
+
+    Throughput and step medians may be worse by tolerance.  p99 latencies and the reset and construction times rest
+    on a handful of samples at the mercy of the scheduler and the garbage collector, they only count when worse by
+    tail_tolerance.
+    """
+
+    baseline_results = {(result['wave'], result['policy']): result for result in baseline['results']}
+    regressions = []
+    for result in current['results']:
+        reference = baseline_results.get((result['wave'], result['policy']))
+        if reference is None:
+            continue
+        for metric, value in result.items():
+            if not (metric in THROUGHPUT_METRICS or metric.endswith('_ms')) or not reference.get(metric):
+                continue
+            change = value / reference[metric] - 1
+            if metric in THROUGHPUT_METRICS:
+                change = -change
+            noisy = metric.endswith('_p99_ms') or metric.startswith(('reset_', 'construct_'))
+            if change > (tail_tolerance if noisy else tolerance):
+                regressions.append(f"wave {result['wave']} {result['policy']}: {metric} "
+                                   f"{reference[metric]:.3f} -> {value:.3f} ({change:+.0%} worse)")
+    return regressions
@@ -1 +1,2 @@
 from .engine import Engine
+from .batch import BatchEngine
@@ -0,0 +1,480 @@
+from typing import Dict
+import numpy as np
+from .config import Config
+from .entities import SPRITE_TYPE_IDS
+from .graphics import load_atlas
+
+
+PLAYER = SPRITE_TYPE_IDS['Player']
+BULLET = SPRITE_TYPE_IDS['Bullet']
+GRUNT = SPRITE_TYPE_IDS['Grunt']
+ELECTRODE = SPRITE_TYPE_IDS['Electrode']
+HULK = SPRITE_TYPE_IDS['Hulk']
+FAMILY = [SPRITE_TYPE_IDS[name] for name in ['Mommy', 'Daddy', 'Mikey']]
+ENEMIES = [GRUNT, ELECTRODE, HULK]
+
+# Offsets of Base.get_vector per direction, NONE to UP_LEFT.
+DIRECTIONS = np.array([(0, 0), (0, -1), (1, -1), (1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1)], dtype=np.int64)
+HULK_DIRECTIONS = np.array([1, 3, 5, 7])
+
+# Wave columns the batch simulates, in the order Engine._initialize_level adds them.
+WAVE_COLUMNS = [(8, SPRITE_TYPE_IDS['Mikey']), (6, SPRITE_TYPE_IDS['Mommy']), (7, SPRITE_TYPE_IDS['Daddy']),
+                (0, GRUNT), (1, ELECTRODE), (2, HULK)]
+# Image each kind starts with, which sets its rect size.
+IMAGES = {PLAYER: 'player7', GRUNT: 'grunt1', HULK: 'hulk4', SPRITE_TYPE_IDS['Mommy']: 'mommy7',
+          SPRITE_TYPE_IDS['Daddy']: 'daddy7', SPRITE_TYPE_IDS['Mikey']: 'mikey7'}
+ELECTRODE_IMAGES = ['electrode1', 'electrode4', 'electrode7', 'electrode10', 'electrode13', 'electrode16', None,
+                    'electrode25', None, 'electrode19']
+
+
+def _overlap(x, y, w, h, other_x, other_y, other_w, other_h) -> np.ndarray:
+    """ pygame.Rect.colliderect over broadcast arrays. """
+
+    return (x < other_x + other_w) & (other_x < x + w) & (y < other_y + other_h) & (other_y < y + h)
+
+
+class BatchEngine:
+    """ num_games independent games held as structure of arrays and advanced together, one array op per rule.
+
+    Covers the player, bullets, Grunts, Electrodes, Hulks and the family with the rules of their sprite classes.
+    Brains, Sphereoids and Quarks are left out of every wave, so waves without Grunts are cleared at once.
+    Differences to Engine: the games share one NumPy random stream, placement keeps enemies off the player box and each
+    other by rejection sampling, electrodes vanish when hit instead of playing their animation and check for contacts
+    after all enemies moved instead of in their own update slot, and family only die to Hulks after the Hulks moved.
+    Games are not bit-identical to Engine games for that reason, they are statistically the same game at a fraction of
+    the cost per frame.
+    """
+
+    BULLET_SIZE = 16
+    BULLET_SPEED = 15
+    PLAYER_SPEED = 5
+    SHOOT_DELAY = 5
+    HULK_SPEED = 7
+    HULK_TURN_PERCENTAGE = 20
+    HULK_MOVE_DELAY = (5, 25)
+    HULK_PUSH = 3
+    PLACEMENT_TRIES = 8
+
+    def __init__(self,
+                 num_games: int,
+                 start_level: int = 1,
+                 lives: int = 3,
+                 config_path: str = None,
+                 godmode: bool = False,
+                 max_bullets: int = 16,
+                 seed: int = None):
+        self.num_games = num_games
+        self.start_level = start_level - 1
+        self.start_lives = lives
+        self.godmode = godmode
+        self.random = np.random.default_rng(seed)
+
+        self.config = Config(config_path)
+        self.grunt = self.config.compile('Grunt', 'grunt', {'score': 0, 'speed': 7, 'move_delay': (5, 25)})
+        self.family = self.config.compile('Family', 'family', {'speed': 4, 'move_delay': 5})
+        self.scores = np.zeros(max(SPRITE_TYPE_IDS.values()) + 1, dtype=np.int64)
+        self.scores[GRUNT] = self.grunt.score
+        self.scores[ELECTRODE] = self.config.compile('Electrode', 'electrode', {'score': 0}).score
+        self.scores[HULK] = self.config.compile('Hulk', 'hulk', {'score': 0}).score
+        self.extra_life_score = self.config.get('extra_life_score')
+
+        (top, left, bottom, right) = self.config.get('play_area')
+        (self.left, self.top, self.right, self.bottom) = (left, top, right, bottom)
+        (self.box_width, self.box_height) = ((right - left) // 3, (bottom - top) // 3)
+
+        sizes = {name: (width, height) for (name, _, width, height) in load_atlas()[1]}
+        self.widths = np.zeros((10, len(self.scores)), dtype=np.int64)
+        self.heights = np.zeros((10, len(self.scores)), dtype=np.int64)
+        for kind, name in IMAGES.items():
+            (self.widths[:, kind], self.heights[:, kind]) = sizes[name]
+        for level, name in enumerate(ELECTRODE_IMAGES):
+            if name is not None:
+                (self.widths[level, ELECTRODE], self.heights[level, ELECTRODE]) = sizes[name]
+        (self.player_width, self.player_height) = sizes[IMAGES[PLAYER]]
+
+        self.waves = self.config.get('waves')
+        self.layouts = [np.repeat([kind for _, kind in WAVE_COLUMNS], [wave[column] for column, _ in WAVE_COLUMNS])
+                        for wave in self.waves]
+        self.capacity = max(len(layout) for layout in self.layouts)
+        self.max_bullets = max_bullets
+
+        shape = (num_games, self.capacity)
+        self.kind = np.zeros(shape, dtype=np.int64)
+        self.x = np.zeros(shape, dtype=np.int64)
+        self.y = np.zeros(shape, dtype=np.int64)
+        self.width = np.zeros(shape, dtype=np.int64)
+        self.height = np.zeros(shape, dtype=np.int64)
+        self.countdown = np.zeros(shape, dtype=np.int64)
+        self.direction = np.zeros(shape, dtype=np.int64)
+        self.ids = np.zeros(shape, dtype=np.int64)
+
+        bullets = (num_games, max_bullets)
+        self.bullet_x = np.zeros(bullets, dtype=np.int64)
+        self.bullet_y = np.zeros(bullets, dtype=np.int64)
+        self.bullet_direction = np.zeros(bullets, dtype=np.int64)
+        self.bullet_ids = np.zeros(bullets, dtype=np.int64)
+
+        self.player_x = np.zeros(num_games, dtype=np.int64)
+        self.player_y = np.zeros(num_games, dtype=np.int64)
+        self.player_ids = np.zeros(num_games, dtype=np.int64)
+        self.shoot_delay = np.zeros(num_games, dtype=np.int64)
+
+        self.frame = np.zeros(num_games, dtype=np.int64)
+        self.level = np.zeros(num_games, dtype=np.int64)
+        self.score = np.zeros(num_games, dtype=np.int64)
+        self.lives = np.zeros(num_games, dtype=np.int64)
+        self.extra_lives = np.zeros(num_games, dtype=np.int64)
+        self.family_collected = np.zeros(num_games, dtype=np.int64)
+        self.done = np.zeros(num_games, dtype=bool)
+        self.entity_count = np.zeros(num_games, dtype=np.int64)
+
+        # Observed columns of the previous get_entity_data(), for velocities.
+        self.observed_ids = None
+        self.observed_x = None
+        self.observed_y = None
+
+        self.reset()
+
+    def reset(self, games: np.ndarray = None, seed: int = None):
+        """ Start new games, all of them unless games lists the indices to restart. """
+
+        if seed is not None:
+            self.random = np.random.default_rng(seed)
+        if games is None:
+            games = np.arange(self.num_games)
+
+        self.frame[games] = 0
+        self.level[games] = self.start_level
+        self.score[games] = 0
+        self.lives[games] = self.start_lives
+        self.extra_lives[games] = 0
+        self.done[games] = False
+        self.entity_count[games] = 0
+        for game in np.asarray(games).tolist():
+            self._initialize_level(game)
+
+    def _next_ids(self, game: int, count: int) -> np.ndarray:
+
+        first = self.entity_count[game] + 1
+        self.entity_count[game] += count
+        return np.arange(first, first + count)
+
+    def _wave(self, game: int) -> int:
+
+        level = int(self.level[game])
+        return level if level < 20 else 20 + level % 20
+
+    def _initialize_level(self, game: int):
+
+        layout = self.layouts[self._wave(game)]
+        count = len(layout)
+        self.kind[game] = 0
+        self.kind[game, :count] = layout
+        self.width[game] = self.widths[self.level[game] % 10, self.kind[game]]
+        self.height[game] = self.heights[self.level[game] % 10, self.kind[game]]
+        self.player_ids[game] = self._next_ids(game, 1)[0]
+        self.ids[game, :count] = self._next_ids(game, count)
+        self.family_collected[game] = 0
+        self._reset_sprites(game, np.arange(count), True)
+
+    def _reset_sprites(self, game: int, slots: np.ndarray, place_all: bool):
+        """ What Player, Bullet, Grunt, Hulk and Family reset() do at a new level or after the player died. """
+
+        self.player_x[game] = self.left + (self.right - self.left) // 2
+        self.player_y[game] = self.top + (self.bottom - self.top) // 2
+        self.shoot_delay[game] = 0
+        self.bullet_direction[game] = 0
+
+        kinds = self.kind[game, slots]
+        timed = (kinds == GRUNT) | (kinds == HULK)
+        self.countdown[game, slots[timed]] = self.random.integers(*self.grunt.move_delay, timed.sum())
+        hulks = slots[kinds == HULK]
+        self.direction[game, hulks] = self.random.choice(HULK_DIRECTIONS, len(hulks))
+        family = slots[np.isin(kinds, FAMILY)]
+        self.direction[game, family] = self.random.integers(1, 8, len(family))
+
+        # After a death Grunts and electrodes stay where they are, like their reset() does.
+        self._place(game, slots if place_all else slots[(kinds == HULK) | np.isin(kinds, FAMILY)])
+
+    def _place(self, game: int, slots: np.ndarray):
+        """ Random spots in the play area off the player box and off the sprites placed before, see Placement. """
+
+        width = self.width[game, slots]
+        height = self.height[game, slots]
+        x = self.random.integers(self.left, self.right - width)
+        y = self.random.integers(self.top, self.bottom - height)
+
+        fixed = np.ones(self.capacity, dtype=bool)
+        fixed[slots] = False
+        fixed &= self.kind[game] != 0
+        (fixed_x, fixed_y, fixed_width, fixed_height) = (self.x[game, fixed], self.y[game, fixed],
+                                                         self.width[game, fixed], self.height[game, fixed])
+        box_x = self.player_x[game] + self.player_width // 2 - self.box_width // 2
+        box_y = self.player_y[game] + self.player_height // 2 - self.box_height // 2
+
+        for _ in range(self.PLACEMENT_TRIES):
+            bad = _overlap(x, y, width, height, box_x, box_y, self.box_width, self.box_height)
+            bad |= _overlap(x[:, None], y[:, None], width[:, None], height[:, None],
+                            fixed_x, fixed_y, fixed_width, fixed_height).any(1)
+            earlier = _overlap(x[:, None], y[:, None], width[:, None], height[:, None], x, y, width, height)
+            bad |= np.tril(earlier, -1).any(1)
+            if not bad.any():
+                break
+            x[bad] = self.random.integers(self.left, self.right - width[bad])
+            y[bad] = self.random.integers(self.top, self.bottom - height[bad])
+
+        self.x[game, slots] = x
+        self.y[game, slots] = y
+
+    def handle_input(self, moves: np.ndarray, shoots: np.ndarray):
+        """ Player.move and Player.shoot for every game still running. """
+
+        active = ~self.done
+        (dx, dy) = DIRECTIONS[moves].T
+        self.player_x[active] = np.clip(self.player_x + dx * self.PLAYER_SPEED, self.left,
+                                        self.right - self.player_width)[active]
+        self.player_y[active] = np.clip(self.player_y + dy * self.PLAYER_SPEED, self.top,
+                                        self.bottom - self.player_height)[active]
+
+        free = self.bullet_direction == 0
+        fire = active & (shoots > 0) & (self.shoot_delay <= 0) & free.any(1)
+        games = np.flatnonzero(fire)
+        slots = free[games].argmax(1)
+        self.bullet_x[games, slots] = self.player_x[games]
+        self.bullet_y[games, slots] = self.player_y[games]
+        self.bullet_direction[games, slots] = shoots[games]
+        self.bullet_ids[games, slots] = self.entity_count[games] + 1
+        self.entity_count[games] += 1
+        self.shoot_delay[games] = self.SHOOT_DELAY
+
+    def tick(self):
+        """ Advance every game one frame, games that are over only count frames like Engine.tick. """
+
+        self.frame += 1
+        active = ~self.done
+        if self.extra_life_score > 0:
+            extra = active & (self.score // self.extra_life_score > self.extra_lives)
+            self.lives += extra
+            self.extra_lives += extra
+
+        kind = self.kind
+        live = active[:, None]
+        self._update_player(active, live)
+        self._update_family(live & np.isin(kind, FAMILY))
+        self._update_grunts(live & (kind == GRUNT))
+        self._update_hulks(live & (kind == HULK))
+        self._update_bullets(live)
+        self._check_electrodes(live)
+        self._check_player(active)
+
+        cleared = active & ~(self.kind == GRUNT).any(1)
+        for game in np.flatnonzero(cleared).tolist():
+            self.level[game] += 1
+            self._initialize_level(game)
+
+    def _update_player(self, active: np.ndarray, live: np.ndarray):
+
+        self.shoot_delay -= active
+        collected = live & np.isin(self.kind, FAMILY) & _overlap(
+            self.x, self.y, self.width, self.height, self.player_x[:, None], self.player_y[:, None],
+            self.player_width, self.player_height)
+        counts = collected.sum(1)
+        for step in range(int(counts.max(initial=0))):
+            collecting = counts > step
+            self.family_collected += collecting
+            self.score += collecting * np.minimum(self.family_collected * 1000, 5000)
+        self.kind[collected] = 0
+
+    def _get_valid(self, x: np.ndarray, y: np.ndarray, width: np.ndarray, height: np.ndarray) -> np.ndarray:
+        """ Base.valid_move: the moved rect stays strictly inside the play area. """
+
+        return (x > self.left) & (y > self.top) & (x + width < self.right) & (y + height < self.bottom)
+
+    def _update_family(self, family: np.ndarray):
+
+        speed = self.family.speed
+        family &= (self.frame % self.family.move_delay == 0)[:, None]
+        if not family.any():
+            return
+
+        (games, slots) = np.nonzero(family)
+        (x, y) = (self.x[games, slots], self.y[games, slots])
+        (width, height) = (self.width[games, slots], self.height[games, slots])
+        # Family only ever pick directions UP to LEFT, Family.move tries range(1, 8).
+        offsets = DIRECTIONS[1:8] * speed
+        valid = self._get_valid(x[:, None] + offsets[:, 0], y[:, None] + offsets[:, 1], width[:, None],
+                                height[:, None])
+
+        direction = self.direction[games, slots]
+        rows = np.arange(len(direction))
+        blocked = (direction == 0) | ~valid[rows, np.maximum(direction, 1) - 1]
+        choice = np.where(valid, self.random.random(valid.shape), -1).argmax(1) + 1
+        direction = np.where(blocked, np.where(valid.any(1), choice, 0), direction)
+
+        self.direction[games, slots] = direction
+        self.x[games, slots] = x + DIRECTIONS[direction, 0] * speed
+        self.y[games, slots] = y + DIRECTIONS[direction, 1] * speed
+
+    def _count_down(self, sprites: np.ndarray) -> np.ndarray:
+        """ Decrement the countdown of sprites and return the ones that move this frame. """
+
+        due = sprites & (self.countdown <= 0)
+        self.countdown[sprites & ~due] -= 1
+        return due
+
+    def _update_grunts(self, grunts: np.ndarray):
+
+        due = self._count_down(grunts)
+        if not due.any():
+            return
+
+        (games, slots) = np.nonzero(due)
+        (x, y) = (self.x[games, slots], self.y[games, slots])
+        (width, height) = (self.width[games, slots], self.height[games, slots])
+        player_x = self.player_x[games] + self.player_width // 2
+        player_y = self.player_y[games] + self.player_height // 2
+
+        # Homing: unit vector from the top left corner to the player center, added to the center and rounded.
+        (dx, dy) = ((player_x - x).astype(np.float64), (player_y - y).astype(np.float64))
+        length = np.hypot(dx, dy)
+        length[length == 0] = 1
+        speed = self.grunt.speed
+        center_x = np.floor(x + width // 2 + dx / length * speed + 0.5).astype(np.int64)
+        center_y = np.floor(y + height // 2 + dy / length * speed + 0.5).astype(np.int64)
+
+        self.x[games, slots] = center_x - width // 2
+        self.y[games, slots] = center_y - height // 2
+        self.countdown[games, slots] = self.random.integers(*self.grunt.move_delay, len(games))
+
+    def _update_hulks(self, hulks: np.ndarray):
+
+        due = self._count_down(hulks)
+        if due.any():
+            (games, slots) = np.nonzero(due)
+            (x, y) = (self.x[games, slots], self.y[games, slots])
+            (width, height) = (self.width[games, slots], self.height[games, slots])
+
+            # Hulk.turn always turns clockwise through UP, RIGHT, DOWN, LEFT.
+            turn = self.random.integers(1, 100, len(games)) < self.HULK_TURN_PERCENTAGE
+            index = (self.direction[games, slots] // 2 + turn) % 4
+            for _ in range(len(HULK_DIRECTIONS)):
+                (dx, dy) = DIRECTIONS[HULK_DIRECTIONS[index]].T * self.HULK_SPEED
+                blocked = ~self._get_valid(x + dx, y + dy, width, height)
+                if not blocked.any():
+                    break
+                index = (index + blocked) % 4
+
+            direction = HULK_DIRECTIONS[index]
+            self.direction[games, slots] = direction
+            self.x[games, slots] = np.clip(x + DIRECTIONS[direction, 0] * self.HULK_SPEED, self.left,
+                                           self.right - width)
+            self.y[games, slots] = np.clip(y + DIRECTIONS[direction, 1] * self.HULK_SPEED, self.top,
+                                           self.bottom - height)
+            self.countdown[games, slots] = self.random.integers(*self.HULK_MOVE_DELAY, len(games))
+
+        # Hulks crush the family they touch.
+        family = np.isin(self.kind, FAMILY)
+        if family.any() and hulks.any():
+            (x, y, width, height) = (self.x, self.y, self.width, self.height)
+            crushed = _overlap(x[:, :, None], y[:, :, None], width[:, :, None], height[:, :, None],
+                               x[:, None, :], y[:, None, :], width[:, None, :], height[:, None, :])
+            crushed &= hulks[:, None, :]
+            self.kind[family & crushed.any(2)] = 0
+
+    def _update_bullets(self, live: np.ndarray):
+
+        bullets = live & (self.bullet_direction > 0)
+        if not bullets.any():
+            return
+
+        direction = self.bullet_direction
+        self.bullet_x += np.where(bullets, DIRECTIONS[direction, 0] * self.BULLET_SPEED, 0)
+        self.bullet_y += np.where(bullets, DIRECTIONS[direction, 1] * self.BULLET_SPEED, 0)
+
+        size = self.BULLET_SIZE
+        games = np.arange(self.num_games)
+        for slot in np.flatnonzero(bullets.any(0)).tolist():
+            flying = bullets[:, slot]
+            (bullet_x, bullet_y) = (self.bullet_x[:, slot, None], self.bullet_y[:, slot, None])
+            hits = flying[:, None] & np.isin(self.kind, ENEMIES) & _overlap(
+                bullet_x, bullet_y, size, size, self.x, self.y, self.width, self.height)
+
+            if hits.any():
+                self.score += (self.scores[self.kind] * hits).sum(1)
+                # Hulks cannot be killed, a hit pushes them along the bullet.
+                pushed = hits & (self.kind == HULK)
+                (dx, dy) = DIRECTIONS[direction[:, slot]].T * self.HULK_PUSH
+                self.x[pushed] = np.clip(self.x + dx[:, None], self.left, self.right - self.width)[pushed]
+                self.y[pushed] = np.clip(self.y + dy[:, None], self.top, self.bottom - self.height)[pushed]
+                self.kind[hits & ~pushed] = 0
+
+            outside = ((bullet_x[:, 0] < self.left) | (bullet_y[:, 0] < self.top) |
+                       (bullet_x[:, 0] + size > self.right) | (bullet_y[:, 0] + size > self.bottom))
+            self.bullet_direction[games[flying & (hits.any(1) | outside)], slot] = 0
+
+    def _check_electrodes(self, live: np.ndarray):
+        """ Any Grunt or Hulk touching an electrode destroys it, checked once after everything moved. """
+
+        electrodes = live & (self.kind == ELECTRODE)
+        if not electrodes.any():
+            return
+
+        walkers = live & ((self.kind == GRUNT) | (self.kind == HULK))
+        (x, y, width, height) = (self.x, self.y, self.width, self.height)
+        touched = _overlap(x[:, :, None], y[:, :, None], width[:, :, None], height[:, :, None],
+                           x[:, None, :], y[:, None, :], width[:, None, :], height[:, None, :])
+        touched &= walkers[:, None, :]
+        self.kind[electrodes & touched.any(2)] = 0
+
+    def _check_player(self, active: np.ndarray):
+
+        if self.godmode:
+            return
+
+        enemies = np.isin(self.kind, ENEMIES)
+        hit = active & (enemies & _overlap(self.x, self.y, self.width, self.height, self.player_x[:, None],
+                                           self.player_y[:, None], self.player_width, self.player_height)).any(1)
+        for game in np.flatnonzero(hit).tolist():
+            self.family_collected[game] = 0
+            if self.lives[game] > 0:
+                self.lives[game] -= 1
+                self._reset_sprites(game, np.flatnonzero(self.kind[game]), False)
+            else:
+                self.done[game] = True
+
+    def family_remaining(self) -> np.ndarray:
+
+        return np.isin(self.kind, FAMILY).sum(1)
+
+    def get_entity_data(self, out: np.ndarray) -> np.ndarray:
+        """ Fill out, a (num_games, capacity, len(Engine.ENTITY_FEATURES)) array, like Engine.get_entity_data.
+
+        Rows are the player, the family and enemies, then the bullets, each game padded with zero rows.
+        """
+
+        kind = np.concatenate([np.full((self.num_games, 1), PLAYER), self.kind,
+                               np.where(self.bullet_direction > 0, BULLET, 0)], axis=1)
+        x = np.concatenate([self.player_x[:, None], self.x, self.bullet_x], axis=1) - self.left
+        y = np.concatenate([self.player_y[:, None], self.y, self.bullet_y], axis=1) - self.top
+        ids = np.where(kind > 0, np.concatenate([self.player_ids[:, None], self.ids, self.bullet_ids], axis=1), 0)
+
+        if self.observed_ids is None or self.observed_ids.shape != ids.shape:
+            (self.observed_ids, self.observed_x, self.observed_y) = (ids, x, y)
+        same = (ids == self.observed_ids) & (ids > 0)
+        dx = np.where(same, x - self.observed_x, 0)
+        dy = np.where(same, y - self.observed_y, 0)
+        (self.observed_ids, self.observed_x, self.observed_y) = (ids, x, y)
+
+        alive = kind > 0
+        order = np.argsort(~alive, axis=1, kind='stable')[:, :out.shape[1]]
+        rows = np.stack([kind, x, y, dx, dy, ids, alive], axis=2)
+        out[:] = 0
+        taken = np.take_along_axis(rows, order[:, :, None], axis=1)
+        taken *= np.take_along_axis(alive, order, axis=1)[:, :, None]
+        out[:, :taken.shape[1]] = taken
+        return out
+
+    def get_infos(self) -> Dict[str, np.ndarray]:
+
+        return {'score': self.score.copy(), 'level': self.level.copy(), 'lives': self.lives.copy(),
+                'family': self.family_remaining()}
@@ -1,15 +1,62 @@
+import hashlib
+from numbers import Real
 from os import path
+from typing import Any, Dict
 import yaml
 
 
+class EntityConfig:
+    """ Settings of one entity class as plain attributes, its config section merged over the class DEFAULTS. """
+
+    def __init__(self, values: Dict[str, Any]):
+        self.__dict__.update(values)
+
+    def __repr__(self):
+        return f'EntityConfig({self.__dict__})'
+
+
 class Config:
 
     def __init__(self, config_path: str = None):
         if config_path is None:
             config_path = path.join(path.dirname(__file__), "config.yaml")
 
-        with open(config_path, 'r') as f:
-            self.config = yaml.load(f, Loader=yaml.FullLoader)
+        with open(config_path, 'rb') as f:
+            data = f.read()
+        self.config = yaml.load(data, Loader=yaml.FullLoader)
+        # Recordings store this to make sure they are replayed with the rules they were played with.
+        self.digest = hashlib.sha1(data).hexdigest()
 
     def get(self, key):
         return self.config[key] if key in self.config else None
+
+    def compile(self, name: str, section: str, defaults: Dict[str, Any]) -> EntityConfig:
+        """ Resolve the settings of entity class name once.
+
+        Values are checked against the type of their default and sequences become tuples, since every sprite of the
+        class shares them.  Keys missing from the section fall back to their default with one warning, keys without
+        a default are kept unchecked.
+        """
+
+        values = self.get(section) or {}
+        compiled = {key: tuple(value) if isinstance(value, list) else value for key, value in values.items()}
+        for key, default in defaults.items():
+            if key not in values:
+                print(f"Warning: Missing config key for class {name}: {key}")
+                value = default
+            else:
+                value = values[key]
+                if isinstance(default, bool):
+                    valid = isinstance(value, bool)
+                elif isinstance(default, Real):
+                    valid = isinstance(value, Real) and not isinstance(value, bool)
+                elif isinstance(default, (list, tuple)):
+                    valid = isinstance(value, (list, tuple)) and len(value) == len(default)
+                else:
+                    valid = True
+                if not valid:
+                    raise ValueError(f"Config key {section}.{key} must look like {default!r}, got {value!r}.")
+
+            compiled[key] = tuple(value) if isinstance(value, list) else value
+
+        return EntityConfig(compiled)
@@ -1,21 +1,42 @@
 import math
 import os
-from typing import List, Tuple
+import weakref
+from typing import Any, Callable, List, Tuple
+import numpy as np
 import pygame
-from .config import Config
-from .graphics import load_graphics
-from .entities import Player, Mommy, Daddy, Mikey, Grunt, Electrode, Hulk, Sphereoid, Quark, Brain
+from .config import Config, EntityConfig
+from .graphics import load_graphics, scale_image
+from .placement import Placement
+from .profiler import Profiler
+from .rng import BlockRandom
+from .state import EngineState
+from .trails import Trails
+from .entities import Player, Mommy, Daddy, Mikey, Grunt, Electrode, Hulk, Sphereoid, Quark, Brain, SPRITE_TYPE_IDS, \
+    ENTITY_CLASSES
 
 
 class Engine:
 
+    RENDER_POLICIES = ['always', 'on_demand', 'never']
+    ENTITY_FEATURES = ['type', 'x', 'y', 'vx', 'vy', 'id', 'alive']
+    # Colors the programming effect of Brains and Progs cycles through, one per frame.
+    PROGRAMMING_COLORS = [(255, 0, 0), (0, 255, 0), (0, 255, 0)]
+
     def __init__(self,
                  start_level: int = 1,
                  lives: int = 3,
                  fps: int = 0,
                  config_path: str = None,
                  godmode: bool = False,
-                 headless: bool = False):
+                 headless: bool = False,
+                 render_policy: str = 'always',
+                 render_size: Tuple[int, int] = None,
+                 grayscale: bool = False,
+                 seed: int = None,
+                 turbo: bool = False):
+        if render_policy not in self.RENDER_POLICIES:
+            raise ValueError(f'Invalid render policy: {render_policy}')
+
         self.godmode = godmode
         self.start_level = start_level - 1
         self.level = self.start_level
@@ -27,31 +48,69 @@ class Engine:
         self.extra_lives = 0
         self.done = False
         self.frame = 0
+        self.draws = 0
+        self.drawn = False
+        self._reset_entity_tracking()
+        self.render_policy = render_policy
+        # All randomness of the game comes from this stream, never from the global random module.
+        self.random = BlockRandom(seed)
 
         self.config = Config(config_path)
-
-        pygame.init()
-        pygame.display.set_caption('Robotron 2084')
-
-        self.clock = pygame.time.Clock()
-        self.font = pygame.font.Font(None, 30)
-
-        screen_size = self.config.get('screen_size')
-        if headless:
-            print("Using dummy video driver.")
-            os.environ["SDL_VIDEODRIVER"] = "dummy"
-
-        self.screen = pygame.display.set_mode(screen_size)
-        self.graphics = load_graphics()
+        self.entity_configs = {}
+        for entity_class in ENTITY_CLASSES:
+            self._get_entity_config(entity_class)
+
+        # Turbo is headless without any pygame subsystem: no display, events, clock, fonts, joystick or audio, and
+        # frames are drawn without the score line.  Only offscreen surfaces are used, which need no initialization.
+        self.turbo = turbo
+        self.headless = headless or turbo
+        if turbo:
+            self.clock = None
+            self.font = None
+        else:
+            if headless:
+                print("Using dummy video driver.")
+                os.environ["SDL_VIDEODRIVER"] = "dummy"
+
+            pygame.init()
+
+            self.clock = pygame.time.Clock()
+            self.font = pygame.font.Font(None, 30)
 
         self.play_area = self.config.get('play_area')
         (top, left, bottom, right) = self.play_area
         self.play_rect = pygame.Rect(left, top, right - left, bottom - top)
 
+        # A render size or grayscale draws only the play area, straight at that size, instead of the full screen.
+        self.reduced = render_size is not None or grayscale
+        self.grayscale = grayscale
+        screen_size = tuple(render_size or self.play_rect.size) if self.reduced else self.config.get('screen_size')
+        if self.headless:
+            # Every headless engine renders into its own surface, so several can share a process.
+            self.screen = pygame.Surface(screen_size)
+        else:
+            pygame.display.set_caption('Robotron 2084')
+            self.screen = pygame.display.set_mode(screen_size)
+        self.view_rect = self.screen.get_rect() if self.reduced else self.play_rect
+        self.graphics = load_graphics(self.screen)
+
+        self.scale = (self.view_rect.width / self.play_rect.width, self.view_rect.height / self.play_rect.height)
+        self.scaled_images = weakref.WeakKeyDictionary()
+        self.tinted_images = weakref.WeakKeyDictionary()
+        self.animation_tables = {}
+        if self.reduced:
+            for image in self.graphics.values():
+                self._get_scaled_image(image)
+
         self.family_group = pygame.sprite.Group()
         self.enemy_group = pygame.sprite.Group()
         self.to_kill_group = pygame.sprite.Group()
         self.all_group = pygame.sprite.Group()
+        # Enemies and family with their rects for the collision queries, gathered at most once per tick.
+        self.enemy_rects = None
+        self.family_rects = None
+        self.placement = Placement(self.play_rect, self.random)
+        self.trails = Trails()
         self.waves = self.config.get('waves')
         self.to_kill_group_types = ['Grunt', 'Sphereoid', 'Enforcer', 'Brain', 'Quark', 'Tank']
         self.enemies = ['grunt', 'electrode', ]
@@ -60,6 +119,7 @@ class Engine:
         self.player = None
         self.player_box = None
         self.family_collected = 0
+        self.profiler = None
 
         self._initialize_level()
 
@@ -78,9 +138,12 @@ class Engine:
 
         for sprite in self.all_group:
             sprite.kill()
+        self.trails.clear()
 
         self.player = Player(self)
         self._add_sprite(self.player)
+        self.placement.reset([], [self._get_player_box()])
+        self.placement.defer()
 
         self.family_collected = 0
 
@@ -96,6 +159,7 @@ class Engine:
         _ = [self._add_enemy(Sphereoid(self)) for _ in range(sphereoids)]
         _ = [self._add_enemy(Quark(self)) for _ in range(quarks)]
         _ = [self._add_enemy(Brain(self)) for _ in range(brains)]
+        self.placement.place_all()
 
     def _set_family_collected(self):
 
@@ -103,6 +167,28 @@ class Engine:
         self.score += min(self.family_collected * 1000, 5000)
         return self.family_collected
 
+    def _get_entity_config(self, entity_class: type) -> EntityConfig:
+
+        entity_config = self.entity_configs.get(entity_class)
+        if entity_config is None:
+            entity_config = self.config.compile(entity_class.__name__, entity_class.get_config_section(),
+                                                entity_class.DEFAULTS)
+            self.entity_configs[entity_class] = entity_config
+
+        return entity_config
+
+    def _next_entity_id(self) -> int:
+
+        self.entity_count += 1
+        return self.entity_count
+
+    def _reset_entity_tracking(self):
+
+        self.entity_count = 0
+        self.entity_frame = -1
+        self.entity_positions = {}
+        self.entity_previous = {}
+
     def _get_play_area_distance(self):
 
         w, h = self.play_rect.size
@@ -120,6 +206,42 @@ class Engine:
 
         return self.all_group
 
+    def _collide_enemies(self, sprite: pygame.sprite.Sprite) -> List[pygame.sprite.Sprite]:
+
+        return self._collide(sprite, self.enemy_group, self._get_enemy_rects())
+
+    def _collide_family(self, sprite: pygame.sprite.Sprite) -> List[pygame.sprite.Sprite]:
+
+        return self._collide(sprite, self.family_group, self._get_family_rects())
+
+    @staticmethod
+    def _collide(sprite: pygame.sprite.Sprite, group: pygame.sprite.Group,
+                 listed: Tuple[List[pygame.sprite.Sprite], List[pygame.Rect]]) -> List[pygame.sprite.Sprite]:
+        """ Same as spritecollide(sprite, group, False), with one collidelistall over the rects listed for group. """
+
+        (sprites, rects) = listed
+        return [sprites[index] for index in sprite.rect.collidelistall(rects) if group.has_internal(sprites[index])]
+
+    def _get_enemy_rects(self) -> Tuple[List[pygame.sprite.Sprite], List[pygame.Rect]]:
+        """ The enemies and their rects, listed once per tick and again whenever an enemy joins or gets a new rect.
+
+        Sprites move their rects in place, so the lists stay current during the tick, but they still hold enemies
+        killed since; callers skip those.
+        """
+
+        if self.enemy_rects is None:
+            enemies = self.enemy_group.sprites()
+            self.enemy_rects = (enemies, [sprite.rect for sprite in enemies])
+        return self.enemy_rects
+
+    def _get_family_rects(self) -> Tuple[List[pygame.sprite.Sprite], List[pygame.Rect]]:
+        """ The family and their rects, see _get_enemy_rects(). """
+
+        if self.family_rects is None:
+            family = self.family_group.sprites()
+            self.family_rects = (family, [sprite.rect for sprite in family])
+        return self.family_rects
+
     def _get_sprite(self, sprite_name: str) -> pygame.Surface:
 
         return self.graphics[sprite_name]
@@ -128,6 +250,19 @@ class Engine:
 
         return [self.graphics[name] for name in sprite_names]
 
+    def _get_animation_table(self, key, build: Callable[[], Any]) -> Any:
+        """ Animation table for key, built by build() once and shared by every sprite asking for the same key. """
+
+        if key is None:
+            return build()
+
+        table = self.animation_tables.get(key)
+        if table is None:
+            table = build()
+            self.animation_tables[key] = table
+
+        return table
+
     def _get_player_box(self):
 
         if self.player_box is None:
@@ -137,6 +272,34 @@ class Engine:
 
         return self.player_box
 
+    def _create_surface(self, size: Tuple[int, int]) -> pygame.Surface:
+
+        return pygame.Surface(size, 0, self.screen)
+
+    def _get_scaled_image(self, image: pygame.Surface) -> pygame.Surface:
+
+        scaled = self.scaled_images.get(image)
+        if scaled is None:
+            scaled = scale_image(image, self.scale, self.grayscale)
+            self.scaled_images[image] = scaled
+
+        return scaled
+
+    def _get_tinted_images(self, image: pygame.Surface) -> List[pygame.Surface]:
+        """ Variants of image subtracted from each programming color, built once and shared by all sprites. """
+
+        tinted = self.tinted_images.get(image)
+        if tinted is None:
+            tinted = []
+            for color in self.PROGRAMMING_COLORS:
+                inv = pygame.Surface(image.get_size(), pygame.SRCALPHA)
+                inv.fill(color)
+                inv.blit(image, (0, 0), None, pygame.BLEND_RGB_SUB)
+                tinted.append(inv)
+            self.tinted_images[image] = tinted
+
+        return tinted
+
     def _add_background(self):
 
         self.screen.fill((0, 0, 0))
@@ -157,19 +320,23 @@ class Engine:
 
         self.family_group.add(family)
         self.all_group.add(family)
+        self.family_rects = None
 
     def _add_enemy(self, enemy: pygame.sprite):
 
         self.enemy_group.add(enemy)
         self.all_group.add(enemy)
+        self.enemy_rects = None
 
         if enemy.__class__.__name__ in self.to_kill_group_types:
             self.to_kill_group.add(enemy)
 
-    def update(self):
+    def tick(self):
+        """ Advance the simulation one frame without drawing it. """
 
-        pygame.event.pump()
-        self.clock.tick(self.fps)
+        if not self.turbo:
+            pygame.event.pump()
+            self.clock.tick(self.fps)
         self.frame += 1
 
         if self.extra_life_score > 0:
@@ -178,14 +345,23 @@ class Engine:
                 self.extra_lives += 1
 
         if not self.done:
+            self.enemy_rects = None
+            self.family_rects = None
+            self.trails.tick()
             self.all_group.update()
 
-            if not self.godmode and pygame.sprite.spritecollide(self.player, self.enemy_group, False):
+            if not self.godmode and self._collide_enemies(self.player):
                 self.family_collected = 0
                 if self.lives > 0:
                     self.lives -= 1
+                    self.placement.reset(self.all_group, [self._get_player_box()])
+                    self.placement.defer()
+                    self.trails.clear()
                     for sprite in self.all_group:
                         sprite.reset()
+                    self.placement.place_all()
+                    # Sprites keep their ids across the reset, so forget where they were before it.
+                    self.entity_positions = {}
                 else:
                     self.done = True
 
@@ -193,17 +369,54 @@ class Engine:
                 self.level += 1
                 self._initialize_level()
 
-        self.draw()
-        image = self.get_image()
+        self._frame_changed()
+
+    def _frame_changed(self):
+
+        self.drawn = False
+        if self.render_policy == 'always':
+            self.draw()
+
+    def update(self):
+
+        self.tick()
+        image = self.get_image() if self.render_policy != 'never' else None
 
         return (image, self.score, self.lives, self.level, self.done)
 
     def draw(self):
 
-        self._add_background()
-        self._add_info()
-        self.all_group.draw(self.screen)
-        pygame.display.update()
+        self.draws += 1
+        self.drawn = True
+        if self.reduced:
+            self._draw_reduced()
+        else:
+            self._add_background()
+            if not self.turbo:
+                self._add_info()
+            self.screen.blits(self.trails.get_live(), False)
+            self.all_group.draw(self.screen)
+        if not self.headless:
+            pygame.display.update()
+
+    def _draw_reduced(self):
+
+        (x, y) = self.play_rect.topleft
+        (scale_x, scale_y) = self.scale
+        self.screen.fill((0, 0, 0))
+        self.screen.blits([(self._get_scaled_image(image), (int((tx - x) * scale_x), int((ty - y) * scale_y)))
+                           for (image, (tx, ty)) in self.trails.get_live()], False)
+        self.screen.blits([(self._get_scaled_image(sprite.image),
+                            (int((sprite.rect.x - x) * scale_x), int((sprite.rect.y - y) * scale_y)))
+                           for sprite in self.all_group], False)
+
+    def render(self):
+        """ Make sure the current frame is drawn, 'on_demand' engines only draw here. """
+
+        if self.render_policy == 'never':
+            raise RuntimeError("Rendering is disabled by render_policy 'never'.")
+        if not self.drawn:
+            self.draw()
 
     def family_remaining(self):
 
@@ -220,8 +433,52 @@ class Engine:
 
         return data
 
-    def reset(self):
+    def get_entity_data(self, out: np.ndarray) -> np.ndarray:
+        """ Fill out, a (capacity, len(ENTITY_FEATURES)) array, with one row per sprite and zero the rest.
+
+        Velocities are the displacement since the previous frame an entity was observed on, and zero on the frame of a
+        death, which puts every sprite back to a start position.  Alive is 0 for sprites that are already done for,
+        like a fading Electrode or a vanished Sphereoid waiting for its spawns.
+        """
+
+        if self.frame != self.entity_frame:
+            self.entity_previous = self.entity_positions
+            self.entity_frame = self.frame
+
+        (top, left, _, _) = self.play_area
+        previous = self.entity_previous
+        positions = {}
+
+        out[:] = 0
+        row = 0
+        capacity = len(out)
+        for sprite in self.all_group:
+            type_id = SPRITE_TYPE_IDS.get(sprite.__class__.__name__)
+            if type_id is None:
+                continue
+
+            x, y = sprite.rect.x - left, sprite.rect.y - top
+            positions[sprite.entity_id] = (x, y)
+            if row < capacity:
+                (px, py) = previous.get(sprite.entity_id, (x, y))
+                out[row] = (type_id, x, y, x - px, y - py, sprite.entity_id, sprite.is_alive())
+                row += 1
+
+        self.entity_positions = positions
+        return out
 
+    def reset(self, seed: int = None) -> List:
+        """ Start a new game like restart() and return its first frame, or None under render_policy 'never'. """
+
+        self.restart(seed)
+        return self.get_image() if self.render_policy != 'never' else None
+
+    def restart(self, seed: int = None):
+        """ Start a new game without reading back a frame, seeding the random stream first when seed is given. """
+
+        if seed is not None:
+            self.random.seed(seed)
+        self._reset_entity_tracking()
         self.frame = 0
         self.level = self.start_level
         self.score = 0
@@ -230,10 +487,65 @@ class Engine:
         self.done = False
 
         self._initialize_level()
+        self._frame_changed()
+
+    def clone_state(self) -> EngineState:
+        """ Snapshot of the dynamic simulation state: sprites, counters, timers, trails and the random state.
+
+        Images, animation tables and config are shared with the live engine, so this is cheap enough to call at every
+        node of a search.  The snapshot stays valid whatever happens to the engine afterwards.
+        """
+
+        return EngineState(self)
+
+    def restore_state(self, state: EngineState):
+        """ Go back to a state cloned from this engine, as often as needed. """
+
+        state.restore(self)
+        self._frame_changed()
+
+    def enable_profiler(self, phases: List[str] = None) -> Profiler:
+        """ Start timing phases and sprite updates, or only the given phases, see Profiler.  Engines without one pay
+        nothing.
+        """
+
+        if self.profiler is None:
+            self.profiler = Profiler(phases)
+            self.profiler.attach(self)
+        return self.profiler
+
+    def disable_profiler(self) -> Profiler:
+
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.detach()
+            self.profiler = None
+        return profiler
+
+    def get_image(self) -> List:
+
+        self.render()
+        return pygame.surfarray.array3d(self.screen).swapaxes(0, 1)
+
+    def get_play_area_image(self, out: np.ndarray = None) -> np.ndarray:
+        """ Copy only the play area of the current frame into a C-contiguous uint8 array of get_observation_shape(). """
+
+        self.render()
+        if out is None:
+            out = np.empty(self.get_observation_shape(), dtype=np.uint8)
+
+        view = self.screen.subsurface(self.view_rect)
+        if self.grayscale:
+            pixels = pygame.surfarray.pixels_red(view)
+            np.copyto(out, pixels.transpose(1, 0))
+        else:
+            pixels = pygame.surfarray.pixels3d(view)
+            np.copyto(out, pixels.transpose(1, 0, 2))
+        del pixels  # Unlocks the screen.
 
-        return self.get_image()
+        return out
 
-    @ staticmethod
-    def get_image() -> List:
+    def get_observation_shape(self) -> Tuple[int, ...]:
 
-        return pygame.surfarray.array3d(pygame.display.get_surface()).swapaxes(0, 1)
+        (width, height) = self.view_rect.size
+        return (height, width) if self.grayscale else (height, width, 3)
@@ -1,9 +1,22 @@
 import pygame
-from .player import Player
+from .player import Player, Bullet
 from .family import Mommy, Daddy, Mikey
 from .grunt import Grunt
 from .electrode import Electrode
 from .hulk import Hulk
 from .sphereoid import Sphereoid
 from .quark import Quark
-from .brain import Brain
+from .brain import Brain, CruiseMissile
+from .prog import Prog
+from .enforcer import Enforcer, EnforcerBullet
+from .tank import Tank, TankShell
+from .floater import Floater
+
+# Stable ids for sprite class names, 0 is reserved for empty slots.
+SPRITE_TYPES = ['Player', 'Bullet', 'Mommy', 'Daddy', 'Mikey', 'Prog', 'Grunt', 'Electrode', 'Hulk', 'Sphereoid',
+                'Enforcer', 'EnforcerBullet', 'Quark', 'Tank', 'TankShell', 'Brain', 'CruiseMissile']
+SPRITE_TYPE_IDS = {name: i for i, name in enumerate(SPRITE_TYPES, 1)}
+
+# Entity classes whose config is compiled when an Engine is built.
+ENTITY_CLASSES = [Bullet, Mommy, Daddy, Mikey, Prog, Grunt, Electrode, Hulk, Sphereoid, Enforcer, EnforcerBullet,
+                  Quark, Tank, TankShell, Brain, CruiseMissile, Floater]
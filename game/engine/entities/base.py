@@ -1,5 +1,4 @@
 import math
-import random
 from typing import TYPE_CHECKING, Tuple
 import pygame
 
@@ -19,15 +18,20 @@ class Base(pygame.sprite.Sprite):
     LEFT = 7
     UP_LEFT = 8
 
+    # Settings read from the config section, named after the class unless CONFIG_SECTION is set.
+    CONFIG_SECTION = None
+    DEFAULTS = {'score': 0}
+
     def __init__(self, engine: 'Engine', **kwargs):
         super().__init__()
         self.engine = engine
+        self.entity_id = engine._next_entity_id()
         self.play_rect = self.engine.play_rect
         self.args = kwargs
-        self.config_dict = self.load_config()
+        self.config = engine._get_entity_config(self.__class__)
 
         self.cycle = None
-        self.animations = self.get_animations()
+        self.animations = self.engine._get_animation_table(self.get_animation_key(), self.get_animations)
         self.animation_step = 0
         self.animation_direction = None
 
@@ -44,22 +48,24 @@ class Base(pygame.sprite.Sprite):
         else:
             self.random_location()
 
-    def load_config(self):
-        return self.engine.config.get(self.__class__.__name__.lower())
+    @classmethod
+    def get_config_section(cls):
 
-    def config(self, key: str, default: any = None):
-        if key not in self.config_dict:
-            print(f"Warning: Missing config key for class {self.__class__.__name__}: {key}")
-        return self.config_dict[key] if key in self.config_dict else default
+        return cls.CONFIG_SECTION or cls.__name__.lower()
 
     def score(self):
 
-        return self.config('score')
+        return self.config.score
 
     def get_animations(self):
 
         raise NotImplementedError()
 
+    def get_animation_key(self):
+        """ Sprites with the same key share one get_animations() table, None builds a private one. """
+
+        return self.__class__.__name__
+
     def update(self):
         """ Just update state of sprites. """
 
@@ -126,6 +132,16 @@ class Base(pygame.sprite.Sprite):
         del killer
         self.kill()
 
+    def kill(self):
+
+        self.engine.placement.release(self)
+        super().kill()
+
+    def is_alive(self) -> bool:
+        """ False for sprites that are done for but still in their groups, like a fading Electrode. """
+
+        return True
+
     def setup(self):
 
         self.reset()
@@ -138,34 +154,14 @@ class Base(pygame.sprite.Sprite):
 
     def random_direction(self):
 
-        return random.randrange(1, 8)
+        return self.engine.random.randrange(1, 8)
 
     def random_location(self):
 
-        (sprite_width, sprite_height) = self.image.get_rect().size
-
         self.rect = self.image.get_rect()
-        player_box = self.engine._get_player_box()
-
-        valid_location = False
-        tries = 0
-        while not valid_location:
-            tries += 1
-            self.rect.x = self.play_rect.x + random.randrange(self.play_rect.width - sprite_width)
-            self.rect.y = self.play_rect.y + random.randrange(self.play_rect.height - sprite_height)
-
-            if tries > 25:
-                print("Warning!  Enemy Placement Overflow.")
-                break
-
-            if player_box.contains(self.rect):
-                continue
-
-            if any(self.rect.colliderect(sprite.rect)
-                    for sprite in self.engine.all_group if self != sprite):
-                continue
-
-            valid_location = True
+        self.engine.placement.place(self)
+        self.engine.enemy_rects = None
+        self.engine.family_rects = None
 
     def get_distance_to_sprite(self, sprite: 'Base'):
 
@@ -1,7 +1,5 @@
-from random import choice, randint
 import pygame
 from .base import Base
-from .floater import Floater
 from .prog import Prog
 
 
@@ -11,29 +9,33 @@ class CruiseMissile(Base):
     TIME_TO_LIVE = 50
     WIDTH = HEIGHT = 4
 
+    DEFAULTS = {'score': 0, 'speed': SPEED, 'time_to_live': TIME_TO_LIVE}
+
     def setup(self):
 
-        self.speed = self.config('speed', self.SPEED)
-        self.time_to_live = self.config('time_to_live', self.TIME_TO_LIVE)
+        self.speed = self.config.speed
+        self.time_to_live = self.config.time_to_live
         self.vector = None
-        self.trail_group = pygame.sprite.Group()
-        self.trail_image = pygame.Surface([self.WIDTH, self.HEIGHT]).convert()
-        pygame.draw.circle(self.trail_image, (255, 255, 255), (self.WIDTH//2, self.HEIGHT//2), 8, 0)
+        self.trail_image = self.engine._get_animation_table('CruiseMissileTrail', self.get_trail_image)
+
+    def get_trail_image(self):
+
+        image = self.engine._create_surface([self.WIDTH, self.HEIGHT])
+        pygame.draw.circle(image, (255, 255, 255), (self.WIDTH//2, self.HEIGHT//2), 8, 0)
+        return image
 
     def get_animations(self):
 
         images = []
         for color in ((255, 0, 0), (0, 255, 0), (0, 255, 0)):
-            image = pygame.Surface([self.WIDTH, self.HEIGHT]).convert()
+            image = self.engine._create_surface([self.WIDTH, self.HEIGHT])
             pygame.draw.circle(image, color, (self.WIDTH//2, self.HEIGHT//2), 8, 0)
             images.append(image)
         return images
 
     def move(self):
 
-        trail = Floater(self.engine, center=self.rect.center, sprite=self.trail_image, delay=20)
-        self.trail_group.add(trail)
-        self.engine._add_sprite(trail)
+        self.engine.trails.add(self.trail_image, self.rect.center, 20, self.entity_id)
         self.vector = self.get_vector_to_player()
         self.rect.center += self.vector * self.speed
 
@@ -48,8 +50,7 @@ class CruiseMissile(Base):
     def die(self, killer):
 
         del killer
-        for sprite in self.trail_group:
-            sprite.kill()
+        self.engine.trails.clear(self.entity_id)
         self.kill()
 
 
@@ -61,6 +62,9 @@ class Brain(Base):
     PROGRAMMING_OFFSET = 5
     SHOOT_DELAY = [30, 70]
 
+    DEFAULTS = {'score': 0, 'speed': SPEED, 'use_mikey_bug': True, 'programming_time': PROGRAMMING_TIME,
+                'programming_offset': PROGRAMMING_OFFSET, 'shoot_delays': SHOOT_DELAY}
+
     def get_animations(self):
 
         return {
@@ -74,18 +78,18 @@ class Brain(Base):
         self.update_animation()
         self.random_location()
 
-        use_mikey_bug = self.config('use_mikey_bug', True)
-        self.shoot_delays = self.config('shoot_delays', self.SHOOT_DELAY)
+        use_mikey_bug = self.config.use_mikey_bug
+        self.shoot_delays = self.config.shoot_delays
 
         family_sprites = self.engine.family_group.sprites()
         self.target = family_sprites[0] if family_sprites and use_mikey_bug else None
-        self.speed = self.config('speed') or self.SPEED
+        self.speed = self.config.speed or self.SPEED
         self.vector = pygame.Vector2(0)
-        self.shoot_delay = randint(*self.shoot_delays)
+        self.shoot_delay = self.engine.random.randint(*self.shoot_delays)
 
         self.programming = False
-        self.programming_time = self.config('programming_time', self.PROGRAMMING_TIME)
-        self.programming_offset = self.config('programming_offset', self.PROGRAMMING_OFFSET)
+        self.programming_time = self.config.programming_time
+        self.programming_offset = self.config.programming_offset
         self.countdown = 0
 
     def update(self):
@@ -107,7 +111,7 @@ class Brain(Base):
         if self.target is None or not self.engine.family_group.has(self.target):
             family_group = self.engine.family_group.sprites()
             if family_group:
-                self.target = choice(family_group)
+                self.target = self.engine.random.choice(family_group)
             else:
                 self.target = self.engine.player
 
@@ -150,14 +154,9 @@ class Brain(Base):
     def program(self):
 
         image = self.animations[self.animation_direction][0]
-        image.set_colorkey((0, 0, 0))
-        color = ((255, 0, 0), (0, 255, 0), (0, 255, 0))[self.engine.frame % 3]
-        inv = pygame.Surface(image.get_size(), pygame.SRCALPHA)
-        inv.fill(color)
-        inv.blit(image, (0, 0), None, pygame.BLEND_RGB_SUB)
-        self.image = inv
+        self.image = self.engine._get_tinted_images(image)[self.engine.frame % len(self.engine.PROGRAMMING_COLORS)]
 
     def shoot(self):
 
-        self.shoot_delay = randint(*self.shoot_delays)
+        self.shoot_delay = self.engine.random.randint(*self.shoot_delays)
         self.engine._add_enemy(CruiseMissile(self.engine, center=self.rect.center))
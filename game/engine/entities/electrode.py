@@ -6,6 +6,10 @@ class Electrode(Base):
     def reset(self):
         self.alive = True
 
+    def get_animation_key(self):
+
+        return self.__class__.__name__, self.engine.level % 10
+
     def get_animations(self):
 
         animation_levels = [
@@ -24,8 +28,7 @@ class Electrode(Base):
 
     def update(self):
         if self.alive:
-            if any(self.rect.colliderect(sprite.rect)
-                   for sprite in self.engine._get_enemy_group() if self != sprite):
+            if any(sprite != self for sprite in self.engine._collide_enemies(self)):
                 self.alive = False
         else:
             self.animation_step += 1
@@ -36,3 +39,7 @@ class Electrode(Base):
 
     def die(self, killer):
         self.alive = False
+
+    def is_alive(self) -> bool:
+
+        return self.alive
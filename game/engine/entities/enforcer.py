@@ -1,4 +1,3 @@
-import random
 import pygame
 from .base import Base
 
@@ -11,9 +10,11 @@ class EnforcerBullet(Base):
     WEIGHT = 2
     WIDTH = HEIGHT = 16
 
+    DEFAULTS = {'score': 0, 'max_speed': MAX_SPEED, 'time_to_live': DEFAULT_TIME_TO_LIVE}
+
     def setup(self):
-        self.time_to_live = self.config('time_to_live', self.DEFAULT_TIME_TO_LIVE)
-        self.max_speed = self.config('max_speed', self.MAX_SPEED)
+        self.time_to_live = self.config.time_to_live
+        self.max_speed = self.config.max_speed
         self.max_distance = self.engine._get_play_area_distance()
         self.vector = None
 
@@ -24,14 +25,14 @@ class EnforcerBullet(Base):
             distance_to_player = self.get_distance_to_player()
             speed = ((distance_to_player * self.max_speed) / self.max_distance) + 1
             player_rect = engine.player.rect
-            x_trajectory = random.randint(player_rect.left - 10, player_rect.right + 10)
-            y_trajectory = random.randint(player_rect.top - 10, player_rect.bottom + 10)
+            x_trajectory = self.engine.random.randint(player_rect.left - 10, player_rect.right + 10)
+            y_trajectory = self.engine.random.randint(player_rect.top - 10, player_rect.bottom + 10)
             new_vector = pygame.Vector2(x_trajectory, y_trajectory) - pygame.Vector2(self.rect.center)
             if new_vector.length() == 0:
 
                 return self.get_trajectory()
             self.vector = new_vector.normalize() * speed
-            self.random_vector = pygame.Vector2(random.random(), random.random())
+            self.random_vector = pygame.Vector2(self.engine.random.random(), self.engine.random.random())
         else:
             self.random_vector *= 1.01
 
@@ -39,11 +40,11 @@ class EnforcerBullet(Base):
 
     def get_animations(self):
 
-        image1 = pygame.Surface([self.WIDTH, self.HEIGHT]).convert()
+        image1 = self.engine._create_surface([self.WIDTH, self.HEIGHT])
         pygame.draw.line(image1, [255, 255, 255], (self.WIDTH, 0), (0, self.HEIGHT), self.WEIGHT)
         pygame.draw.line(image1, [255, 255, 255], (0, 0), (self.WIDTH, self.HEIGHT), self.WEIGHT)
         image1.set_colorkey((0, 0, 0))
-        image2 = pygame.Surface([self.WIDTH, self.HEIGHT]).convert()
+        image2 = self.engine._create_surface([self.WIDTH, self.HEIGHT])
         pygame.draw.line(image2, [255, 255, 255], (self.WIDTH // 2, 0), (self.WIDTH // 2, self.HEIGHT), self.WEIGHT)
         pygame.draw.line(image2, [255, 255, 255], (0, self.HEIGHT // 2), (self.WIDTH, self.HEIGHT // 2), self.WEIGHT)
         image2.set_colorkey((0, 0, 0))
@@ -69,13 +70,15 @@ class Enforcer(Base):
     MAX_SPEED = 20
     SHOOT_DELAYS = [10, 30]
 
+    DEFAULTS = {'score': 0, 'max_speed': MAX_SPEED, 'shoot_delays': SHOOT_DELAYS}
+
     def get_animations(self):
 
         return self.engine._get_sprites(['enforcer2', 'enforcer3', 'enforcer4', 'enforcer5', 'enforcer6', 'enforcer1'])
 
     def setup(self):
-        self.max_speed = self.config('max_speed', self.MAX_SPEED)
-        self.shoot_delays = self.config('shoot_delays', self.SHOOT_DELAYS)
+        self.max_speed = self.config.max_speed
+        self.shoot_delays = self.config.shoot_delays
 
         self.animation_step = 0
         self.animation_delay = 0
@@ -87,7 +90,7 @@ class Enforcer(Base):
         self.max_distance = self.engine._get_play_area_distance()
         self.offset_update = 0
         self.random_offset = 0
-        self.shoot_delay = random.randint(*self.shoot_delays)
+        self.shoot_delay = self.engine.random.randint(*self.shoot_delays)
 
     def update(self):
         self.update_animation()
@@ -110,8 +113,8 @@ class Enforcer(Base):
 
         if self.active:
             if self.offset_update <= 0:
-                self.random_offset = random.randint(-5, 1)
-                self.offset_update = random.randint(10, 30)
+                self.random_offset = self.engine.random.randint(-5, 1)
+                self.offset_update = self.engine.random.randint(10, 30)
 
             self.offset_update -= 1
 
@@ -124,7 +127,7 @@ class Enforcer(Base):
 
         self.shoot_delay -= 1
         if self.shoot_delay <= 0:
-            self.shoot_delay = random.randint(*self.shoot_delays)
+            self.shoot_delay = self.engine.random.randint(*self.shoot_delays)
             self.engine._add_enemy(EnforcerBullet(self.engine, center=self.rect.center))
 
     def reset(self):
@@ -1,5 +1,3 @@
-import random
-import pygame
 from .base import Base
 from .floater import Floater
 
@@ -9,20 +7,19 @@ class Family(Base):
     SPEED = 4
     MOVE_DELAY = 5
 
+    CONFIG_SECTION = 'family'
+    DEFAULTS = {'speed': SPEED, 'move_delay': MOVE_DELAY}
+
     def setup(self):
 
-        self.speed = self.config('speed', self.SPEED)
-        self.move_delay = self.config('move_delay', self.MOVE_DELAY)
+        self.speed = self.config.speed
+        self.move_delay = self.config.move_delay
 
         self.reset()
 
-    def load_config(self):
-
-        return self.engine.config.get('family')
-
     def reset(self):
 
-        self.move_direction = random.randrange(1, 8)
+        self.move_direction = self.engine.random.randrange(1, 8)
         self.update_animation()
         self.random_location()
 
@@ -58,7 +55,7 @@ class Family(Base):
                     direction = 0
                     break
 
-                direction = random.choice(valid_directions)
+                direction = self.engine.random.choice(valid_directions)
 
             self.vector = self.get_vector(direction)
             self.rect.center += self.vector
@@ -81,7 +78,7 @@ class Family(Base):
         if self.engine.frame % self.move_delay == 0:
             self.move()
 
-        for sprite in pygame.sprite.spritecollide(self, self.engine._get_enemy_group(), False):
+        for sprite in self.engine._collide_enemies(self):
             if sprite.__class__.__name__ == 'Hulk':
                 self.die(sprite)
 
@@ -3,9 +3,15 @@ from .base import Base
 
 class Floater(Base):
 
+    DEFAULTS = {}
+
     def setup(self):
         self.delay = self.args['delay'] if 'delay' in self.args else 15
 
+    def get_animation_key(self):
+
+        return None
+
     def get_animations(self):
 
         keys = self.args.keys()
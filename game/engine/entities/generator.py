@@ -1,4 +1,3 @@
-import random
 import pygame
 from .base import Base
 from .floater import Floater
@@ -10,11 +9,13 @@ class Generator(Base):
     SPAWN_DELAY = [8, 64]
     MAX_SPAWN_COUNT = [1, 6]
 
+    DEFAULTS = {'score': 0, 'spawn_delays': SPAWN_DELAY, 'spawn_counts': MAX_SPAWN_COUNT}
+
     def reset(self):
         self.cycle = self.PRE_SPAWN_CYCLE_LIMIT
-        self.spawn_delays = self.config('spawn_delays', self.SPAWN_DELAY)
-        self.spawn_delay = random.randrange(*self.spawn_delays)
-        self.spawn_count = random.randrange(*self.config('spawn_counts', self.MAX_SPAWN_COUNT))
+        self.spawn_delays = self.config.spawn_delays
+        self.spawn_delay = self.engine.random.randrange(*self.spawn_delays)
+        self.spawn_count = self.engine.random.randrange(*self.config.spawn_counts)
         self.alive = True
         self.move_curvature = pygame.Vector2(0)
         self.move_deltas = pygame.Vector2(0)
@@ -43,7 +44,7 @@ class Generator(Base):
     def spawn(self):
 
         self.cycle = len(self.animations)
-        self.spawn_delay = random.randrange(*self.spawn_delays)
+        self.spawn_delay = self.engine.random.randrange(*self.spawn_delays)
         self.spawn_count -= 1
 
         spawn = self.get_spawn()
@@ -61,3 +62,8 @@ class Generator(Base):
 
         self.rect.center = -100, -100
         self.alive = False
+
+    def is_alive(self) -> bool:
+        """ A vanished generator only waits off screen for its spawns to die. """
+
+        return self.alive
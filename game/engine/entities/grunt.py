@@ -1,4 +1,3 @@
-import random
 from .base import Base
 
 
@@ -12,7 +11,7 @@ class Grunt(Base):
     def reset(self):
         self.speed = 7
         self.move_delay = (5, 25)
-        self.move_countdown = random.randrange(*self.move_delay)
+        self.move_countdown = self.engine.random.randrange(*self.move_delay)
 
     def move(self):
 
@@ -22,6 +21,6 @@ class Grunt(Base):
     def update(self):
         if self.move_countdown <= 0:
             self.move()
-            self.move_countdown = random.randrange(*self.move_delay)
+            self.move_countdown = self.engine.random.randrange(*self.move_delay)
         else:
             self.move_countdown -= 1
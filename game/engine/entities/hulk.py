@@ -1,5 +1,3 @@
-import random
-import pygame
 from .base import Base
 
 
@@ -21,10 +19,10 @@ class Hulk(Base):
         self.speed = 7
         self.turn_percentage = 20
         self.move_delay = (5, 25)
-        self.move_countdown = random.randrange(*self.move_delay)
+        self.move_countdown = self.engine.random.randrange(*self.move_delay)
 
         self.move_directions = [self.UP, self.RIGHT, self.DOWN, self.LEFT]
-        self.direction = random.choice(self.move_directions)
+        self.direction = self.engine.random.choice(self.move_directions)
         self.animation_direction = self.get_direction_string(self.direction)
 
     def get_direction_string(self, direction: int):
@@ -41,7 +39,7 @@ class Hulk(Base):
     def turn(self):
 
         idx = self.move_directions.index(self.direction)
-        if random.randrange(0, 1) == 0:
+        if self.engine.random.randrange(0, 1) == 0:
             idx += 1
             if idx >= len(self.move_directions):
                 idx = 0
@@ -54,7 +52,7 @@ class Hulk(Base):
 
     def move(self):
 
-        if random.randrange(1, 100) < self.turn_percentage:
+        if self.engine.random.randrange(1, 100) < self.turn_percentage:
             self.turn()
 
         i = 0
@@ -73,11 +71,11 @@ class Hulk(Base):
     def update(self):
         if self.move_countdown <= 0:
             self.move()
-            self.move_countdown = random.randrange(*self.move_delay)
+            self.move_countdown = self.engine.random.randrange(*self.move_delay)
         else:
             self.move_countdown -= 1
 
-        for sprite in pygame.sprite.spritecollide(self, self.engine.family_group, False):
+        for sprite in self.engine._collide_family(self):
             sprite.die(self)
 
     def die(self, killer):
@@ -11,17 +11,22 @@ class Bullet(Base):
     WIDTH = 16
     HEIGHT = 16
 
+    DEFAULTS = {}
+
     def __init__(self, engine: 'Engine', x, y, direction):
         self.direction = direction
-        super().__init__(engine)
-        self.rect = pygame.Rect(x, y, self.WIDTH, self.HEIGHT)
+        super().__init__(engine, center=(x + self.WIDTH // 2, y + self.HEIGHT // 2))
         self.speed = 15
 
+    def get_animation_key(self):
+
+        return self.__class__.__name__, self.direction
+
     def get_animations(self):
 
         weight = 2
 
-        image = pygame.Surface([self.WIDTH, self.HEIGHT]).convert()
+        image = self.engine._create_surface([self.WIDTH, self.HEIGHT])
 
         if self.direction in [self.UP, self.DOWN]:
             pygame.draw.line(image, (255, 255, 255), (self.WIDTH // 2, 0), (self.WIDTH // 2, self.HEIGHT), weight)
@@ -38,7 +43,7 @@ class Bullet(Base):
         vector = self.get_vector(self.direction)
         self.rect.center += vector
 
-        hits = pygame.sprite.spritecollide(self, self.engine._get_enemy_group(), False)
+        hits = self.engine._collide_enemies(self)
         for sprite in hits:
             self.engine.score += sprite.score()
             sprite.die(self)
@@ -66,15 +71,16 @@ class Player(pygame.sprite.Sprite):
         super().__init__()
         self.image = None
 
-        self.animations = {
+        self.animations = engine._get_animation_table(self.__class__.__name__, lambda: {
             'left': engine._get_sprites(['player1', 'player2', 'player1', 'player3']),
             'right': engine._get_sprites(['player4', 'player5', 'player4', 'player6']),
             'down': engine._get_sprites(['player7', 'player8', 'player7', 'player9']),
             'up': engine._get_sprites(['player10', 'player11', 'player10', 'player12']),
-        }
+        })
 
         self.play_rect = engine.play_rect
         self.engine = engine
+        self.entity_id = engine._next_entity_id()
         self.speed = 5
         self.shoot_delay = 5
         self.shoot_delay_remaining = 0
@@ -95,6 +101,10 @@ class Player(pygame.sprite.Sprite):
         self.rect.x = self.play_rect.x + (self.play_rect.width // 2)
         self.rect.y = self.play_rect.y + (self.play_rect.height // 2)
 
+    def is_alive(self) -> bool:
+
+        return True
+
     def move(self, move):
 
         if move:
@@ -128,7 +138,7 @@ class Player(pygame.sprite.Sprite):
 
         self.shoot_delay_remaining -= 1
 
-        for sprite in pygame.sprite.spritecollide(self, self.engine.family_group, False):
+        for sprite in self.engine._collide_family(self):
             sprite.collected()
 
     def _set_animation_direction(self, direction):
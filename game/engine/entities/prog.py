@@ -1,6 +1,4 @@
-import random
 import pygame
-from .floater import Floater
 from .family import Family
 
 
@@ -10,20 +8,22 @@ class Prog(Family):
     MOVE_DELAY = 5
     PROGRAMMING_TIME = 60
 
+    CONFIG_SECTION = 'prog'
+    DEFAULTS = {'score': 0, 'speed': SPEED, 'move_delay': MOVE_DELAY, 'programming_time': PROGRAMMING_TIME}
+
     def setup(self):
-        self.speed = self.config('speed', Prog.SPEED)
-        self.move_delay = self.config('move_delay', Prog.MOVE_DELAY)
-        self.programming_time = self.config('programming_time', Prog.PROGRAMMING_TIME)
+        self.speed = self.config.speed
+        self.move_delay = self.config.move_delay
+        self.programming_time = self.config.programming_time
 
         self.vector = None
         self.offset = 0
-        self.trail_group = pygame.sprite.Group()
 
         self.reset()
 
-    def load_config(self):
+    def get_animation_key(self):
 
-        return self.engine.config.get('prog')
+        return self.__class__.__name__, self.args['family']
 
     def get_animations(self):
 
@@ -42,11 +42,7 @@ class Prog(Family):
             self.animation_step = 0
 
         image = animations[self.animation_step]
-        color = ((255, 0, 0), (0, 255, 0), (0, 255, 0))[self.engine.frame % 3]
-        inv = pygame.Surface(image.get_size(), pygame.SRCALPHA)
-        inv.fill(color)
-        inv.blit(image, (0, 0), None, pygame.BLEND_RGB_SUB)
-        self.image = inv
+        self.image = self.engine._get_tinted_images(image)[self.engine.frame % len(self.engine.PROGRAMMING_COLORS)]
 
     def reset(self):
         return self.kill()
@@ -58,12 +54,12 @@ class Prog(Family):
             x = 1 if prect.x > self.rect.x else -1
             y = 1 if prect.y > self.rect.y else -1
 
-            if random.random() < 0.25:
+            if self.engine.random.random() < 0.25:
                 x = -x
-            if random.random() < 0.25:
+            if self.engine.random.random() < 0.25:
                 y = -y
             self.vector = pygame.Vector2(x, y)
-        self.engine._add_sprite(Floater(self.engine, center=self.rect.center, sprite=self.image, delay=5))
+        self.engine.trails.add(self.image, self.rect.center, 5, self.entity_id)
         self.rect.center += self.vector * self.speed
         self.rect.clamp_ip(self.play_rect)
 
@@ -73,8 +69,7 @@ class Prog(Family):
     def die(self, killer):
 
         del killer
-        for sprite in self.trail_group:
-            sprite.kill()
+        self.engine.trails.clear(self.entity_id)
         self.kill()
 
     def update(self):
@@ -84,7 +79,7 @@ class Prog(Family):
         if self.programming_time > 0:
             if self.engine.frame % 2 == 0:
                 self.rect.y -= self.offset
-                self.offset = random.randint(0, self.rect.height) - (self.rect.height // 2)
+                self.offset = self.engine.random.randint(0, self.rect.height) - (self.rect.height // 2)
                 self.rect.y += self.offset
             self.programming_time -= 1
         else:
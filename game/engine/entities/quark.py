@@ -1,4 +1,3 @@
-import random
 import pygame
 from .generator import Generator
 from .tank import Tank
@@ -9,10 +8,12 @@ class Quark(Generator):
     SPEED = 1
     MAX_MOVE_DELAY = [5, 30]
 
+    DEFAULTS = dict(Generator.DEFAULTS, speed=SPEED, move_delays=MAX_MOVE_DELAY)
+
     def setup(self):
         super().setup()
-        self.speed = self.config('speed', self.SPEED)
-        self.move_delays = self.config('move_delays', self.MAX_MOVE_DELAY)
+        self.speed = self.config.speed
+        self.move_delays = self.config.move_delays
         self.vector = pygame.Vector2(0)
         self.turn_delay = 0
 
@@ -23,9 +24,9 @@ class Quark(Generator):
 
     def move(self):
         if self.turn_delay == 0:
-            self.turn_delay += random.randint(*self.move_delays)
-            self.vector = pygame.Vector2(random.choice([-self.speed, self.speed]),
-                                         random.choice([-self.speed, self.speed]))*5
+            self.turn_delay += self.engine.random.randint(*self.move_delays)
+            self.vector = pygame.Vector2(self.engine.random.choice([-self.speed, self.speed]),
+                                         self.engine.random.choice([-self.speed, self.speed]))*5
         else:
             self.turn_delay -= 1
 
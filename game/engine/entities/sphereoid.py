@@ -1,4 +1,3 @@
-import random
 from .enforcer import Enforcer
 from .generator import Generator
 
@@ -9,11 +8,13 @@ class Sphereoid(Generator):
     MOVE_DELAYS = [10, 32]
     MOVE_CURVATURES = [-50, 50]
 
+    DEFAULTS = dict(Generator.DEFAULTS, speed=SPEED, move_delays=MOVE_DELAYS, move_curvatures=MOVE_CURVATURES)
+
     def reset(self):
         super().reset()
-        self.speed = self.config('speed', self.SPEED)
-        self.move_delays = self.config('move_delays', self.MOVE_DELAYS)
-        self.move_curvatures = self.config('move_curvatures', self.MOVE_CURVATURES)
+        self.speed = self.config.speed
+        self.move_delays = self.config.move_delays
+        self.move_curvatures = self.config.move_curvatures
         self.update_curvature_and_countdowns()
 
     def get_animations(self):
@@ -28,9 +29,9 @@ class Sphereoid(Generator):
 
     def update_curvature_and_countdowns(self):
 
-        self.move_curvature.x = random.randint(*self.move_curvatures) / 1000
-        self.move_curvature.y = random.randint(*self.move_curvatures) / 1000
-        self.move_delay = random.randrange(*self.move_delays)
+        self.move_curvature.x = self.engine.random.randint(*self.move_curvatures) / 1000
+        self.move_curvature.y = self.engine.random.randint(*self.move_curvatures) / 1000
+        self.move_delay = self.engine.random.randrange(*self.move_delays)
 
     def move(self):
 
@@ -1,4 +1,3 @@
-from random import randint, randrange
 import pygame
 from .base import Base
 
@@ -12,15 +11,17 @@ class TankShell(Base):
     WIDTH = HEIGHT = 16
     WEIGHT = 2
 
+    DEFAULTS = {'score': 0, 'min_speed': MIN_SPEED, 'max_speed': MAX_SPEED, 'time_to_live': TIME_TO_LIVE}
+
     def setup(self):
-        self.min_speed = self.config('min_speed', self.MIN_SPEED)
-        self.max_speed = self.config('max_speed', self.MAX_SPEED)
-        self.time_to_live = self.config('time_to_live', self.TIME_TO_LIVE)
+        self.min_speed = self.config.min_speed
+        self.max_speed = self.config.max_speed
+        self.time_to_live = self.config.time_to_live
         self.vector = None
 
     def get_animations(self):
 
-        image = pygame.Surface([self.WIDTH, self.HEIGHT]).convert()
+        image = self.engine._create_surface([self.WIDTH, self.HEIGHT])
         pygame.draw.circle(image, (255, 0, 0), (self.WIDTH//2, self.HEIGHT//2), 8, self.WEIGHT)
         return [image]
 
@@ -32,7 +33,7 @@ class TankShell(Base):
             self.speed = ((distance_to_player * self.max_speed) / max_distance) + self.min_speed
             x, y = self.rect.center
             player_x, player_y = self.engine.player.rect.center
-            attack = randrange(10)
+            attack = self.engine.random.randrange(10)
             if attack < 2:
 
                 self.vector = self.get_vector_to_point((x + (player_x - x) // 2, self.play_rect.top))
@@ -80,11 +81,13 @@ class Tank(Base):
     BULLETS = 20
     SHOOT_DELAYS = (15, 60)
 
+    DEFAULTS = {'score': 0, 'bullets': BULLETS, 'shoot_delays': SHOOT_DELAYS}
+
     def setup(self):
 
-        self.bullets = self.config('bullets', self.BULLETS)
-        self.shoot_delays = self.config('shoot_delays', self.SHOOT_DELAYS)
-        self.shoot_delay = randint(*self.shoot_delays)
+        self.bullets = self.config.bullets
+        self.shoot_delays = self.config.shoot_delays
+        self.shoot_delay = self.engine.random.randint(*self.shoot_delays)
         self.active = 0
 
     def get_animations(self):
@@ -107,7 +110,7 @@ class Tank(Base):
             self.shoot_delay -= 1
             if self.shoot_delay == 0:
                 self.bullets -= 1
-                self.shoot_delay = randint(*self.shoot_delays)
+                self.shoot_delay = self.engine.random.randint(*self.shoot_delays)
                 bullet = TankShell(self.engine, center=self.rect.center)
                 self.engine._add_sprite(bullet)
                 self.engine._add_enemy(bullet)
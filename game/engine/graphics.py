@@ -1,14 +1,20 @@
+import hashlib
+import json
+import os
 from os import path
-from typing import Dict
+from typing import Dict, List, Tuple
+import numpy as np
 import pygame
 
 
-def load_graphics() -> Dict[str, pygame.Surface]:
+ATLAS_VERSION = 1
+CACHE_DIR = os.environ.get('ROBOTRON_CACHE_DIR', path.join(path.expanduser('~'), '.cache', 'robotron'))
 
-    def _get_image(x: int, y: int, width: int, height: int) -> pygame.Surface:
-        image = pygame.Surface([width, height]).convert()
-        image.blit(spritesheet, (0, 0), (x, y, width, height))
-        return image
+# Atlases already loaded by this process, keyed by resource file stats.  Forked workers inherit the memory map.
+_atlases = {}
+
+
+def _get_resource_paths() -> Tuple[str, str]:
 
     dirname = path.dirname(__file__)
     resource_path = path.join(dirname, "..", "..", "resources")
@@ -16,15 +22,31 @@ def load_graphics() -> Dict[str, pygame.Surface]:
     def_path = path.join(resource_path, "sprites.txt")
     if not path.exists(spritesheet_path) or not path.exists(def_path):
         raise Exception("sprite.jpg and sprite.txt required to be in resources.")
+    return spritesheet_path, def_path
+
+
+def _get_atlas_key(paths: Tuple[str, ...]) -> str:
+
+    digest = hashlib.sha1(str(ATLAS_VERSION).encode())
+    for resource in paths:
+        with open(resource, 'rb') as resource_file:
+            digest.update(hashlib.sha1(resource_file.read()).digest())
+    return digest.hexdigest()
+
+
+def _build_atlas(spritesheet_path: str, def_path: str) -> Tuple[np.ndarray, List[list]]:
+    """ Decode the spritesheet and pack every sprite's RGB pixels, row after row, into one array. """
 
     try:
-        spritesheet = pygame.image.load(spritesheet_path).convert()
+        spritesheet = pygame.image.load(spritesheet_path)
         spritesheet.set_colorkey((0, 0, 0))
     except pygame.error as pygame_exception:
         print("Unable to load spritesheet image.")
         raise SystemExit from pygame_exception
 
-    sprites = {}
+    sprites = []
+    index = []
+    offset = 0
     rowheight = 0
     i = x = y = 0
     ssw, _ = spritesheet.get_rect().size
@@ -40,9 +62,80 @@ def load_graphics() -> Dict[str, pygame.Surface]:
                 y += rowheight + 10
                 rowheight = 0
 
-            sprites[name] = _get_image(x, y, w, h)
+            image = pygame.Surface([w, h])
+            image.blit(spritesheet, (0, 0), (x, y, w, h))
+            sprites.append(pygame.surfarray.array3d(image).swapaxes(0, 1))
+            index.append([name, offset, w, h])
+            offset += w * h
             x += w + 10
             if h > rowheight:
                 rowheight = h
 
+    pixels = np.concatenate([sprite.reshape(-1, 3) for sprite in sprites]).astype(np.uint8)
+    return pixels, index
+
+
+def load_atlas(cache_dir: str = CACHE_DIR) -> Tuple[np.ndarray, List[list]]:
+    """ Packed sprite pixels and their index, memory mapped from the cache in cache_dir when it is there.
+
+    Cache files are named by the hashes of the resource files, so edited resources are decoded again.  When the cache
+    cannot be written the atlas is only kept in this process.
+    """
+
+    paths = _get_resource_paths()
+    stats = tuple((os.stat(resource).st_mtime_ns, os.stat(resource).st_size) for resource in paths)
+    if (stats, cache_dir) in _atlases:
+        return _atlases[(stats, cache_dir)]
+
+    atlas = None
+    if cache_dir is not None:
+        name = path.join(cache_dir, f'atlas-{_get_atlas_key(paths)}')
+        try:
+            with open(f'{name}.json', 'r', encoding="utf-8") as index_file:
+                atlas = (np.load(f'{name}.npy', mmap_mode='r'), json.load(index_file))
+        except (OSError, ValueError):
+            atlas = None
+
+    if atlas is None:
+        atlas = _build_atlas(*paths)
+        if cache_dir is not None:
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+                # Write under temporary names and rename, concurrent workers never see a partial file.
+                temporary = f'{name}.{os.getpid()}'
+                np.save(f'{temporary}.npy', atlas[0])
+                with open(f'{temporary}.json', 'w', encoding="utf-8") as index_file:
+                    json.dump(atlas[1], index_file)
+                os.replace(f'{temporary}.npy', f'{name}.npy')
+                os.replace(f'{temporary}.json', f'{name}.json')
+                atlas = (np.load(f'{name}.npy', mmap_mode='r'), atlas[1])
+            except OSError as exception:
+                print(f"Unable to write sprite atlas cache: {exception}")
+
+    _atlases[(stats, cache_dir)] = atlas
+    return atlas
+
+
+def load_graphics(target: pygame.Surface, cache_dir: str = CACHE_DIR) -> Dict[str, pygame.Surface]:
+    """ Build the sprite surfaces, with the same pixel format as target, from the packed sprite atlas. """
+
+    (pixels, index) = load_atlas(cache_dir)
+    sprites = {}
+    for (name, offset, width, height) in index:
+        source = pygame.image.frombuffer(pixels[offset:offset + width * height], (width, height), 'RGB')
+        image = pygame.Surface([width, height], 0, target)
+        image.blit(source, (0, 0))
+        sprites[name] = image
+
     return sprites
+
+
+def scale_image(image: pygame.Surface, scale: Tuple[float, float], grayscale: bool = False) -> pygame.Surface:
+
+    (width, height) = image.get_size()
+    size = (max(1, round(width * scale[0])), max(1, round(height * scale[1])))
+    if size != (width, height):
+        image = pygame.transform.smoothscale(image, size)
+    if grayscale:
+        image = pygame.transform.grayscale(image)
+    return image
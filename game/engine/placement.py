@@ -0,0 +1,146 @@
+from typing import Iterable, Tuple
+import numpy as np
+import pygame
+
+
+class Placement:
+    """ Occupancy grid of the play area used to drop sprites on free spots.
+
+    Every sprite on the board marks the cells its rect touches, so checking a spot costs one small array lookup
+    instead of a scan over all sprites.  After a few random misses the position is sampled directly among the
+    windows of free cells large enough for the sprite, so crowded waves still find room without retry loops.  Killed
+    sprites release their cells, see Base.kill(), and every reset() rebuilds the grid from the sprites on the board.
+    Whole waves are placed in one pass, see defer() and place_all().
+    """
+
+    TRIES = 4
+
+    def __init__(self, play_rect: pygame.Rect, rng, cell_size: int = 8):
+        self.play_rect = play_rect
+        self.random = rng
+        self.cell_size = cell_size
+        self.columns = -(-play_rect.width // cell_size)
+        self.rows = -(-play_rect.height // cell_size)
+        self.occupied = np.zeros((self.rows, self.columns), dtype=np.int32)
+        self.integral = None
+        self.windows = {}
+        self.pending = None
+
+    def _window(self, rect: pygame.Rect) -> Tuple[int, int, int, int]:
+
+        size = self.cell_size
+        left = max(0, (rect.left - self.play_rect.left) // size)
+        top = max(0, (rect.top - self.play_rect.top) // size)
+        right = min(self.columns, (rect.right - 1 - self.play_rect.left) // size + 1)
+        bottom = min(self.rows, (rect.bottom - 1 - self.play_rect.top) // size + 1)
+        return left, top, max(left, right), max(top, bottom)
+
+    def _mark(self, window: Tuple[int, int, int, int], count: int):
+
+        (left, top, right, bottom) = window
+        self.occupied[top:bottom, left:right] += count
+        self.integral = None
+
+    def reset(self, sprites: Iterable[pygame.sprite.Sprite], blocked: Iterable[pygame.Rect] = ()):
+        """ Start over with only the blocked rects and the current rects of sprites occupied. """
+
+        self.occupied[:] = 0
+        self.windows = {}
+        for rect in blocked:
+            self._mark(self._window(rect), 1)
+        for sprite in sprites:
+            self.windows[sprite] = self._window(sprite.rect)
+            self._mark(self.windows[sprite], 1)
+
+    def release(self, sprite: pygame.sprite.Sprite):
+        """ Free the cells marked for sprite, which is leaving the board or about to be placed again. """
+
+        window = self.windows.pop(sprite, None)
+        if window is not None:
+            self._mark(window, -1)
+
+    def defer(self):
+        """ Only collect the sprites passed to place() from now on, until place_all() places them. """
+
+        self.pending = []
+
+    def place(self, sprite: pygame.sprite.Sprite):
+        """ Move sprite.rect to a random free spot inside the play area and mark it occupied. """
+
+        self.release(sprite)
+        if self.pending is not None:
+            self.pending.append(sprite)
+        else:
+            self._place(sprite)
+
+    def place_all(self, sprites: Iterable[pygame.sprite.Sprite] = None):
+        """ Place sprites, by default the ones deferred since defer(), in order and like place() one by one.
+
+        All of them leave their cells first.  The free windows of each sprite size are then found once and kept
+        current as the sprites land, rather than rebuilt after every placement that misses its random tries.
+        """
+
+        if sprites is None:
+            (sprites, self.pending) = (self.pending or [], None)
+        sprites = list(sprites)
+        for sprite in sprites:
+            self.release(sprite)
+
+        free = {}
+        for sprite in sprites:
+            self._place(sprite, free)
+
+    def _place(self, sprite: pygame.sprite.Sprite, free: dict = None):
+
+        rect = sprite.rect
+        size = self.cell_size
+        span_x = -(-rect.width // size)
+        span_y = -(-rect.height // size)
+
+        # Sprites land inside a window of whole cells ending inside the play area, so they never straddle a cell
+        # more than needed and always fit.
+        columns = (self.play_rect.width - 1) // size - span_x + 1
+        rows = (self.play_rect.height - 1) // size - span_y + 1
+        if columns <= 0 or rows <= 0:
+            raise ValueError(f'Sprite of size {rect.size} does not fit in the play area.')
+
+        occupied = self.occupied
+        for _ in range(self.TRIES):
+            (column, row) = (self.random.randrange(columns), self.random.randrange(rows))
+            if not occupied[row:row + span_y, column:column + span_x].any():
+                break
+        else:
+            if free is None:
+                windows = np.flatnonzero(self._free_windows(span_x, span_y, columns, rows))
+            else:
+                if (span_x, span_y) not in free:
+                    free[(span_x, span_y)] = self._free_windows(span_x, span_y, columns, rows)
+                windows = np.flatnonzero(free[(span_x, span_y)])
+            if len(windows):
+                (row, column) = divmod(int(windows[self.random.randrange(len(windows))]), columns)
+            else:
+                print("Warning!  Enemy Placement Overflow.")
+
+        rect.x = self.play_rect.x + column * size + self.random.randrange(span_x * size - rect.width + 1)
+        rect.y = self.play_rect.y + row * size + self.random.randrange(span_y * size - rect.height + 1)
+        self.windows[sprite] = (column, row, column + span_x, row + span_y)
+        self._mark(self.windows[sprite], 1)
+
+        # Windows of any size that overlap the new sprite are not free anymore.
+        if free:
+            for (free_x, free_y), mask in free.items():
+                mask[max(0, row - free_y + 1):row + span_y, max(0, column - free_x + 1):column + span_x] = False
+
+    def _free_windows(self, span_x: int, span_y: int, columns: int, rows: int) -> np.ndarray:
+        """ Mask over a rows x columns grid of the span_x by span_y windows without occupied cells. """
+
+        if self.integral is None:
+            self.integral = np.zeros((self.rows + 1, self.columns + 1), dtype=np.int32)
+            np.cumsum(np.cumsum(self.occupied, axis=0), axis=1, out=self.integral[1:, 1:])
+
+        integral = self.integral
+        sums = (integral[span_y:span_y + rows, span_x:span_x + columns]
+                - integral[:rows, span_x:span_x + columns]
+                - integral[span_y:span_y + rows, :columns]
+                + integral[:rows, :columns])
+        return sums == 0
@@ -0,0 +1,166 @@
+import json
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, List
+
+
+class Profiler:
+    """ Opt-in wall time accounting for one Engine, see Engine.enable_profiler().
+
+    The profiler wraps the phase methods of the engine instance it is attached to and replaces the update() of
+    all_group with one that times every sprite by class.  Detaching deletes those instance attributes again, so an
+    engine without a profiler runs exactly the code it always did.  Phase times are inclusive: 'tick' contains
+    'update', and 'update' contains the collision queries the sprites make.  Self times leave out the phases called
+    from within, like a draw a readback had to make first.  A profiler made for some phases only wraps those, and
+    times sprites only with 'update' among them.
+    """
+
+    # (phase, path of the object from the engine, method name)
+    PHASES = [
+        ('tick', '', 'tick'),
+        ('collide_enemies', '', '_collide_enemies'),
+        ('collide_family', '', '_collide_family'),
+        ('initialize_level', '', '_initialize_level'),
+        ('draw', '', 'draw'),
+        ('draw_background', '', '_add_background'),
+        ('draw_info', '', '_add_info'),
+        ('draw_sprites', 'all_group', 'draw'),
+        ('readback', '', 'get_image'),
+        ('readback', '', 'get_play_area_image'),
+        ('readback', '', 'get_entity_data'),
+    ]
+
+    def __init__(self, phases: List[str] = None):
+        self.phases = phases
+        self.engine = None
+        self.wrapped = []
+        self.frames = 0
+        self.phase_times = defaultdict(float)
+        self.phase_self_times = defaultdict(float)
+        self.phase_calls = defaultdict(int)
+        # Time spent in nested phases, one entry per phase in progress.
+        self.nested = []
+        self.update_times = defaultdict(float)
+        self.update_calls = defaultdict(int)
+        self.entity_counts = {}
+
+        self.trace_frames = 0
+        self.events: List[Dict[str, Any]] = []
+        self.origin = time.perf_counter()
+
+    def attach(self, engine):
+
+        if self.engine is not None:
+            raise RuntimeError('Profiler is already attached to an engine.')
+        self.engine = engine
+
+        for phase, path, name in self.PHASES:
+            if self.phases is None or phase in self.phases:
+                owner = getattr(engine, path) if path else engine
+                setattr(owner, name, self._wrap(phase, getattr(owner, name)))
+                self.wrapped.append((owner, name))
+
+        if self.phases is None or 'update' in self.phases:
+            group = engine.all_group
+            group.update = self._wrap('update', self._get_update(group))
+            self.wrapped.append((group, 'update'))
+
+    def detach(self):
+
+        for owner, name in self.wrapped:
+            del owner.__dict__[name]
+        self.wrapped = []
+        self.engine = None
+
+    def reset(self):
+        """ Forget everything measured so far. """
+
+        self.frames = 0
+        for counters in [self.phase_times, self.phase_self_times, self.phase_calls, self.update_times,
+                         self.update_calls]:
+            counters.clear()
+        self.entity_counts = {}
+        self.events = []
+
+    def trace(self, frames: int):
+        """ Record every timed call of the next frames ticks for export_chrome_trace(). """
+
+        self.events = []
+        self.trace_frames = frames
+
+    def _wrap(self, phase: str, function: Callable) -> Callable:
+
+        clock = time.perf_counter
+        phase_times = self.phase_times
+        phase_self_times = self.phase_self_times
+        phase_calls = self.phase_calls
+        nested = self.nested
+
+        def timed(*args, **kwargs):
+            start = clock()
+            nested.append(0.0)
+            try:
+                return function(*args, **kwargs)
+            finally:
+                end = clock()
+                inner = nested.pop()
+                if nested:
+                    nested[-1] += end - start
+                phase_times[phase] += end - start
+                phase_self_times[phase] += end - start - inner
+                phase_calls[phase] += 1
+                if self.trace_frames:
+                    self._add_event(phase, 'phase', start, end)
+                    if phase == 'tick':
+                        self.trace_frames -= 1
+                if phase == 'tick':
+                    self.frames += 1
+
+        return timed
+
+    def _get_update(self, group) -> Callable:
+
+        clock = time.perf_counter
+        update_times = self.update_times
+        update_calls = self.update_calls
+
+        # Same iteration as AbstractGroup.update, over a copy so sprites may leave or join the group.
+        def update(*args, **kwargs):
+            counts = defaultdict(int)
+            for sprite in group.sprites():
+                name = sprite.__class__.__name__
+                start = clock()
+                sprite.update(*args, **kwargs)
+                end = clock()
+                update_times[name] += end - start
+                update_calls[name] += 1
+                counts[name] += 1
+                if self.trace_frames:
+                    self._add_event(name, 'update', start, end)
+            self.entity_counts = dict(counts)
+
+        return update
+
+    def _add_event(self, name: str, category: str, start: float, end: float):
+
+        self.events.append({'name': name, 'cat': category, 'ph': 'X', 'pid': 0, 'tid': 0,
+                            'ts': (start - self.origin) * 1e6, 'dur': (end - start) * 1e6})
+
+    def get_summary(self) -> Dict[str, Any]:
+        """ Milliseconds and calls per phase and per updated sprite class, and the sprites of the last frame. """
+
+        return {
+            'frames': self.frames,
+            'phases': {phase: {'ms': self.phase_times[phase] * 1000, 'self_ms': self.phase_self_times[phase] * 1000,
+                               'calls': self.phase_calls[phase]}
+                       for phase in self.phase_times},
+            'updates': {name: {'ms': self.update_times[name] * 1000, 'calls': self.update_calls[name]}
+                        for name in self.update_times},
+            'entities': dict(self.entity_counts),
+        }
+
+    def export_chrome_trace(self, path: str):
+        """ Write the traced frames in the Trace Event Format read by chrome://tracing and Perfetto. """
+
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': self.events, 'displayTimeUnit': 'ms'}, f)
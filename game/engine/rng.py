@@ -0,0 +1,62 @@
+from typing import Sequence
+import numpy as np
+
+
+class BlockRandom:
+    """ Seeded random stream of one Engine, with the subset of the random module API the entities use.
+
+    Uniform floats are generated by NumPy a block at a time and handed out from a plain list, so each draw is a list
+    index instead of a call into the generator.  Every Engine owns one, engines in the same process never perturb
+    each other and a seed reproduces a whole game.
+    """
+
+    BLOCK_SIZE = 4096
+
+    def __init__(self, seed: int = None):
+        self.generator = None
+        self.block = []
+        self.index = 0
+        self.seed(seed)
+
+    def seed(self, seed: int = None):
+
+        self.generator = np.random.default_rng(seed)
+        self.block = []
+        self.index = 0
+
+    def random(self) -> float:
+
+        index = self.index
+        if index >= len(self.block):
+            self.block = self.generator.random(self.BLOCK_SIZE).tolist()
+            index = 0
+        self.index = index + 1
+        return self.block[index]
+
+    def randrange(self, start: int, stop: int = None) -> int:
+
+        if stop is None:
+            (start, stop) = (0, start)
+        if stop <= start:
+            raise ValueError(f'Empty range for randrange({start}, {stop}).')
+        return start + int(self.random() * (stop - start))
+
+    def randint(self, a: int, b: int) -> int:
+
+        return self.randrange(a, b + 1)
+
+    def choice(self, sequence: Sequence):
+
+        if not sequence:
+            raise IndexError('Cannot choose from an empty sequence.')
+        return sequence[int(self.random() * len(sequence))]
+
+    def getstate(self) -> tuple:
+
+        # Blocks are replaced, never modified, so the current one can be shared with the state.
+        return self.generator.bit_generator.state, self.block, self.index
+
+    def setstate(self, state: tuple):
+
+        (generator_state, self.block, self.index) = state
+        self.generator.bit_generator.state = generator_state
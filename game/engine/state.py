@@ -0,0 +1,103 @@
+from typing import Any, Dict, List, Tuple
+import numpy as np
+import pygame
+
+
+# Engine attributes that change while a game is played, everything else is fixed at construction.
+ENGINE_ATTRIBUTES = ['frame', 'level', 'score', 'lives', 'extra_lives', 'done', 'family_collected', 'player',
+                     'entity_count', 'entity_frame', 'entity_positions', 'entity_previous']
+
+
+class _GroupState:
+    """ Members of a group held in a sprite attribute, such as the spawns of a Generator. """
+
+    __slots__ = ('group_class', 'members')
+
+    def __init__(self, group: pygame.sprite.AbstractGroup):
+        self.group_class = group.__class__
+        self.members = tuple(group)
+
+
+# Attribute values sprites change in place, everything else is only ever replaced.
+_COPIED_CLASSES = {pygame.Rect, pygame.Vector2}
+_GROUP_CLASSES = {pygame.sprite.Group}
+
+
+def _capture(sprite: pygame.sprite.Sprite) -> Dict[str, Any]:
+
+    attributes = sprite.__dict__.copy()
+    del attributes['_Sprite__g']
+    for key, value in attributes.items():
+        value_class = value.__class__
+        if value_class in _COPIED_CLASSES:
+            attributes[key] = value.copy()
+        elif value_class in _GROUP_CLASSES:
+            attributes[key] = _GroupState(value)
+    return attributes
+
+
+class EngineState:
+    """ Dynamic simulation state of an Engine, see Engine.clone_state().
+
+    Sprites are kept by reference with a copy of their attributes, so restoring brings back the very same sprite
+    objects and everything immutable (images, animation tables, config) stays shared.
+    """
+
+    __slots__ = ('engine', 'attributes', 'sprites', 'groups', 'trails', 'random_state')
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.attributes = {name: getattr(engine, name) for name in ENGINE_ATTRIBUTES}
+        self.sprites = [(sprite, _capture(sprite)) for sprite in engine.all_group]
+        self.groups = [tuple(group) for group in _get_groups(engine)]
+        trails = engine.trails
+        self.trails = (trails.positions.copy(), trails.lifetimes.copy(), trails.owners.copy(), list(trails.images),
+                       trails.next)
+        self.random_state = engine.random.getstate()
+
+    def restore(self, engine):
+
+        if engine is not self.engine:
+            raise ValueError("States can only be restored into the engine they were cloned from.")
+
+        for group in _get_groups(engine):
+            group.empty()
+
+        local_groups: List[Tuple[pygame.sprite.AbstractGroup, tuple]] = []
+        for sprite, attributes in self.sprites:
+            values: Dict[str, Any] = sprite.__dict__
+            memberships = values['_Sprite__g']
+            memberships.clear()
+            values.clear()
+            values.update(attributes)
+            for key, value in attributes.items():
+                value_class = value.__class__
+                if value_class in _COPIED_CLASSES:
+                    values[key] = value.copy()
+                elif value_class is _GroupState:
+                    group = value.group_class()
+                    local_groups.append((group, value.members))
+                    values[key] = group
+            values['_Sprite__g'] = memberships
+
+        for group, members in zip(_get_groups(engine), self.groups):
+            group.add(*members)
+        for group, members in local_groups:
+            group.add(*members)
+
+        for name, value in self.attributes.items():
+            setattr(engine, name, value)
+
+        trails = engine.trails
+        (positions, lifetimes, owners, images, trails.next) = self.trails
+        np.copyto(trails.positions, positions)
+        np.copyto(trails.lifetimes, lifetimes)
+        np.copyto(trails.owners, owners)
+        trails.images[:] = images
+
+        engine.random.setstate(self.random_state)
+
+
+def _get_groups(engine) -> List[pygame.sprite.AbstractGroup]:
+
+    return [engine.all_group, engine.family_group, engine.enemy_group, engine.to_kill_group]
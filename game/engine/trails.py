@@ -0,0 +1,52 @@
+from typing import List, Tuple
+import numpy as np
+import pygame
+
+
+class Trails:
+    """ Fixed-capacity ring buffer of short-lived trail images.
+
+    Trails are purely cosmetic, so they are not sprites: they never enter a group, a collision check or the
+    observations, and adding one only writes a slot.  When the buffer is full the oldest trail is overwritten.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self.capacity = capacity
+        self.positions = np.zeros((capacity, 2), dtype=np.int32)
+        self.lifetimes = np.zeros(capacity, dtype=np.int32)
+        self.owners = np.zeros(capacity, dtype=np.int64)
+        self.images = [None] * capacity
+        self.next = 0
+
+    def add(self, image: pygame.Surface, center: Tuple[int, int], lifetime: int, owner: int = 0):
+        """ Show image centered on center for the next lifetime frames, owner is an entity id for clear(). """
+
+        (width, height) = image.get_size()
+        slot = self.next
+        self.next = (slot + 1) % self.capacity
+        self.positions[slot] = (center[0] - width // 2, center[1] - height // 2)
+        self.lifetimes[slot] = lifetime
+        self.owners[slot] = owner
+        self.images[slot] = image
+
+    def tick(self):
+
+        self.lifetimes[self.lifetimes > 0] -= 1
+
+    def clear(self, owner: int = None):
+        """ Remove every trail, or only the trails of owner. """
+
+        if owner is None:
+            self.lifetimes[:] = 0
+        else:
+            self.lifetimes[self.owners == owner] = 0
+
+    def get_live(self) -> List[Tuple[pygame.Surface, Tuple[int, int]]]:
+        """ (image, top left) of the visible trails, oldest first. """
+
+        slots = np.flatnonzero(self.lifetimes)
+        if len(slots) == 0:
+            return []
+        slots = np.roll(slots, -int(np.searchsorted(slots, self.next)))
+        images = self.images
+        return [(images[slot], position) for slot, position in zip(slots.tolist(), self.positions[slots].tolist())]
@@ -1,13 +1,20 @@
-from typing import Tuple
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Sequence, Tuple
 import numpy as np
 import gym
 from .engine import Engine
-from .utils import crop
+from .recording import Recording
+
+# The integer entries of Environment.get_info(), the ones vector environments and trajectories keep as arrays.
+INFO_KEYS = ['score', 'level', 'lives', 'family']
 
 
 class Environment(gym.Env):
 
     FAMILY_REWARD = 10.0
+    OBSERVATION_TYPES = ['pixels', 'entities']
 
     def __init__(self,
                  level: int = 1,
@@ -16,30 +23,83 @@ class Environment(gym.Env):
                  config_path: str = None,
                  godmode: bool = False,
                  always_move: bool = False,
-                 headless: bool = True):
+                 headless: bool = True,
+                 reuse_observation: bool = False,
+                 frame_skip: int = 1,
+                 max_pool: bool = True,
+                 render_policy: str = None,
+                 observation_type: str = 'pixels',
+                 max_entities: int = 256,
+                 render_size: Tuple[int, int] = None,
+                 grayscale: bool = False,
+                 seed: int = None,
+                 profile: bool = False,
+                 turbo: bool = False):
+
+        if frame_skip < 1:
+            raise ValueError(f'frame_skip must be at least 1, got {frame_skip}.')
+        if observation_type not in self.OBSERVATION_TYPES:
+            raise ValueError(f'Invalid observation type: {observation_type}')
+        if render_policy == 'never' and observation_type == 'pixels':
+            raise ValueError("render_policy 'never' needs observation_type 'entities', pixels are never drawn.")
 
         self.engine = Engine(start_level=level, lives=lives, fps=fps, config_path=config_path,
-                             godmode=godmode, headless=headless)
-        width, height = self.engine.play_rect.size
-        play_area = (height, width, 3)
+                             godmode=godmode, headless=headless,
+                             render_policy=render_policy or ('on_demand' if headless or turbo else 'always'),
+                             render_size=render_size, grayscale=grayscale, seed=seed, turbo=turbo)
+        play_area = self.engine.get_observation_shape()
 
         self.score = 0
         self.action_mod = 1 if always_move else 0
         self.actions = 8 if always_move else 9
         self.action_space = gym.spaces.Discrete(self.actions * self.actions)
-        self.observation_space = gym.spaces.Box(low=0, high=255, shape=play_area, dtype=np.uint8)
         self.metadata = {'render.modes': ['human', 'rgb_array']}
 
+        # 'entities' observations hold one row of Engine.ENTITY_FEATURES per sprite, padded with zero rows.
+        self.observation_type = observation_type
+        if observation_type == 'entities':
+            self.observation_space = gym.spaces.Box(low=-np.inf, high=np.inf, dtype=np.float32,
+                                                    shape=(max_entities, len(Engine.ENTITY_FEATURES)))
+        else:
+            self.observation_space = gym.spaces.Box(low=0, high=255, shape=play_area, dtype=np.uint8)
+
+        # With reuse_observation every observation is written into the same preallocated buffer.
+        space = self.observation_space
+        self.observation = np.empty(space.shape, dtype=space.dtype) if reuse_observation else None
+
+        # Each step repeats the action frame_skip times, max pooling the last two frames against sprite flicker.
+        self.frame_skip = frame_skip
+        pool = frame_skip > 1 and max_pool and observation_type == 'pixels'
+        self.pool = np.empty(play_area, dtype=np.uint8) if pool else None
+
+        # The last frame read back, kept for get_pixels() and render().  Pooled observations go into the observation
+        # buffer, so the frame then needs a buffer of its own.
+        self.pixels = None
+        self.pixels_draws = -1
+        self.pixels_buffer = self.observation if observation_type == 'pixels' else None
+        if pool:
+            self.pixels_buffer = np.empty(play_area, dtype=np.uint8) if reuse_observation else None
+
+        self.recording = None
+        self.executor = None
+        # With profile the info of every step carries the timings accumulated so far under 'profile'.
+        if profile:
+            self.engine.enable_profiler()
+
     def get_board_size(self):
 
         return self.engine.play_rect.size
 
-    def reset(self):
+    def reset(self, out: np.ndarray = None, seed: int = None):
+        """ Start a new game, the same seed always plays out the same game for the same actions. """
 
         self.score = 0
-        return self.get_state(self.engine.reset())
+        if self.recording is not None:
+            seed = self.recording.start_episode(seed)
+        self.engine.restart(seed)
+        return self.get_state(out)
 
-    def step(self,  action: int) -> Tuple[np.ndarray, int, bool, dict]:
+    def step(self,  action: int, out: np.ndarray = None) -> Tuple[np.ndarray, int, bool, dict]:
 
         if not 0 <= action <= self.action_space.n:
             raise ValueError(f'Action {action} is invalid.')
@@ -47,32 +107,149 @@ class Environment(gym.Env):
         move = action // self.actions
         shoot = action % self.actions
 
-        self.engine.handle_input(move + self.action_mod, shoot + self.action_mod)
-        (image, score, lives, level, dead) = self.engine.update()
+        lives = self.engine.lives
+        pooled_level = None
+        for frame in range(self.frame_skip):
+            self.engine.handle_input(move + self.action_mod, shoot + self.action_mod)
+            if self.recording is not None:
+                self.recording.add(move + self.action_mod, shoot + self.action_mod)
+            self.engine.tick()
+
+            last = self.engine.done or self.engine.lives < lives or frame == self.frame_skip - 1
+            if last:
+                break
+
+            if self.pool is not None and frame == self.frame_skip - 2:
+                self.engine.get_play_area_image(self.pool)
+                pooled_level = self.engine.level
+
+        # A frame from before a death or from the previous level has nothing in common with the last one.
+        if pooled_level == self.engine.level and not (self.engine.done or self.engine.lives < lives):
+            if out is None:
+                out = self.observation if self.observation is not None else np.empty_like(self.pool)
+            state = np.maximum(self.get_pixels(), self.pool, out=out)
+        else:
+            state = self.get_state(out)
 
+        dead = self.engine.done
         reward = (self.engine.score - self.score) / 100.0
         self.score = self.engine.score
 
         if dead:
             reward = -1
 
-        return self.get_state(image), reward, dead, {
-            'score': score,
-            'level': level,
-            'lives': lives,
+        return state, reward, dead, self.get_info()
+
+    def record(self, recording: Recording = None) -> Recording:
+        """ Record the seed and inputs of every episode from the next reset() on, see Replayer. """
+
+        if recording is None:
+            engine = self.engine
+            recording = Recording(engine.start_level + 1, engine.start_lives, engine.godmode, engine.config.digest)
+        self.recording = recording
+        return recording
+
+    def stop_recording(self) -> Recording:
+
+        (recording, self.recording) = (self.recording, None)
+        return recording
+
+    def clone_state(self) -> tuple:
+        """ Snapshot of the game for restore_state(), see Engine.clone_state(). """
+
+        return self.engine.clone_state(), self.score
+
+    def restore_state(self, state: tuple, out: np.ndarray = None) -> np.ndarray:
+        """ Go back to a snapshot taken with clone_state() and return its observation. """
+
+        (engine_state, self.score) = state
+        self.engine.restore_state(engine_state)
+        return self.get_state(out)
+
+    def get_info(self) -> dict:
+
+        info = {
+            'score': self.engine.score,
+            'level': self.engine.level,
+            'lives': self.engine.lives,
             'family': self.engine.family_remaining(),
             'data': self.engine.get_sprite_data(),
         }
-
-    def get_state(self, image):
-
-        image = crop(image, self.engine.play_area)
-        return image
+        if self.engine.profiler is not None:
+            info['profile'] = self.engine.profiler.get_summary()
+        return info
+
+    def get_state(self, out: np.ndarray = None) -> np.ndarray:
+
+        if self.observation_type == 'entities':
+            if out is None:
+                out = self.observation
+            if out is None:
+                out = np.empty(self.observation_space.shape, dtype=np.float32)
+            return self.engine.get_entity_data(out)
+
+        if out is None and self.pool is not None:
+            out = self.observation  # Pooled or not, observations go to the observation buffer, see __init__.
+        return self.get_pixels(out)
+
+    def get_pixels(self, out: np.ndarray = None) -> np.ndarray:
+        """ Play area of the current frame, read back at most once per frame unless out is passed.
+
+        With out the frame is copied there and out is returned, the cached frame stays the environment's own.
+        """
+
+        self.engine.render()
+        if self.pixels is not None and self.pixels_draws == self.engine.draws:
+            if out is None:
+                return self.pixels
+            np.copyto(out, self.pixels)
+            return out
+        if out is not None:
+            return self.engine.get_play_area_image(out)
+
+        self.pixels = self.engine.get_play_area_image(self.pixels_buffer)
+        self.pixels_draws = self.engine.draws
+        return self.pixels
 
     def render(self, mode='human'):
 
-        image = self.engine.get_image()
         if mode == 'human':
-            return image
+            return self.engine.get_image()
         else:
-            return self.get_state(image)
+            return self.get_pixels()
+
+    async def astep(self, action: int, out: np.ndarray = None) -> Tuple[np.ndarray, int, bool, dict]:
+        """ step() on the worker thread of this environment, the event loop keeps running meanwhile.
+
+        Await several environments with asyncio.gather, or use astep_many() to handle them as they finish.  The
+        engine is only ever touched by that one thread, so do not call step() while an astep() is pending.
+        """
+
+        return await asyncio.get_running_loop().run_in_executor(self._get_executor(), self.step, action, out)
+
+    async def areset(self, out: np.ndarray = None, seed: int = None) -> np.ndarray:
+
+        reset = functools.partial(self.reset, out, seed)
+        return await asyncio.get_running_loop().run_in_executor(self._get_executor(), reset)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(1, thread_name_prefix='Environment')
+        return self.executor
+
+    def close(self):
+
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+
+
+async def astep_many(envs: Sequence[Environment], actions: Sequence[int]) -> AsyncIterator[Tuple[int, tuple]]:
+    """ Step every environment concurrently, yielding (index, step result) in the order they finish. """
+
+    async def step(index: int) -> Tuple[int, tuple]:
+        return index, await envs[index].astep(actions[index])
+
+    for result in asyncio.as_completed([step(index) for index in range(len(envs))]):
+        yield await result
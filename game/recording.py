@@ -0,0 +1,109 @@
+import secrets
+from typing import Iterator, List, Tuple
+import numpy as np
+from .engine import Engine
+
+
+class Recording:
+    """ Everything needed to play games again: settings, config hash, and per episode a seed and the inputs.
+
+    Inputs are the (move, shoot) pair handed to Engine.handle_input on every frame, so a recording does not depend on
+    frame_skip or always_move.  Saved recordings are compressed npz files of a few bytes per frame.
+    """
+
+    VERSION = 1
+
+    def __init__(self, level: int = 1, lives: int = 3, godmode: bool = False, config_hash: str = ''):
+        self.level = level
+        self.lives = lives
+        self.godmode = godmode
+        self.config_hash = config_hash
+        self.seeds: List[int] = []
+        self.inputs: List[List[Tuple[int, int]]] = []
+
+    def start_episode(self, seed: int = None) -> int:
+        """ Begin a new episode and return its seed, a random one when seed is None. """
+
+        if seed is None:
+            seed = secrets.randbits(32)
+        self.seeds.append(seed)
+        self.inputs.append([])
+        return seed
+
+    def add(self, move: int, shoot: int):
+
+        if not self.inputs:
+            raise RuntimeError('Recording has no episode, reset the environment first.')
+        self.inputs[-1].append((move, shoot))
+
+    def get_inputs(self, episode: int) -> np.ndarray:
+
+        return np.array(self.inputs[episode], dtype=np.uint8).reshape(-1, 2)
+
+    def __len__(self):
+
+        return len(self.seeds)
+
+    def save(self, path: str):
+
+        inputs = [self.get_inputs(episode) for episode in range(len(self))]
+        np.savez_compressed(path,
+                            version=self.VERSION,
+                            settings=np.array([self.level, self.lives, self.godmode], dtype=np.int64),
+                            config_hash=np.array(self.config_hash),
+                            seeds=np.array(self.seeds, dtype=np.uint64),
+                            lengths=np.array([len(episode) for episode in inputs], dtype=np.int64),
+                            inputs=np.concatenate(inputs) if inputs else np.zeros((0, 2), dtype=np.uint8))
+
+    @classmethod
+    def load(cls, path: str) -> 'Recording':
+
+        with np.load(path) as data:
+            if int(data['version']) != cls.VERSION:
+                raise ValueError(f"Unsupported recording version {int(data['version'])} in {path}.")
+            (level, lives, godmode) = data['settings'].tolist()
+            recording = cls(level, lives, bool(godmode), str(data['config_hash']))
+            recording.seeds = data['seeds'].tolist()
+            if recording.seeds:
+                offsets = np.cumsum(data['lengths'])[:-1]
+                recording.inputs = [[tuple(pair) for pair in episode.tolist()]
+                                    for episode in np.split(data['inputs'], offsets)]
+        return recording
+
+
+class Replayer:
+    """ Plays recorded episodes again on a headless engine as fast as possible.
+
+    Nothing is drawn unless asked for: replay() hands out the engine after every frame, so frames, sprite data or
+    entity tensors are produced only for the frames that need them.  Episodes are independent, so a dataset can be
+    regenerated in parallel with one Replayer per process.
+    """
+
+    def __init__(self, recording: Recording, config_path: str = None, **engine_kwargs):
+        self.recording = recording
+        engine_kwargs.setdefault('render_policy', 'on_demand')
+        engine_kwargs.setdefault('turbo', True)
+        self.engine = Engine(start_level=recording.level, lives=recording.lives, godmode=recording.godmode,
+                             config_path=config_path, headless=True, **engine_kwargs)
+        if recording.config_hash and recording.config_hash != self.engine.config.digest:
+            raise ValueError('Recording was made with a different config file.')
+
+    def replay(self, episode: int = 0) -> Iterator[Engine]:
+        """ Yield the engine after each recorded frame of episode. """
+
+        engine = self.engine
+        engine.restart(self.recording.seeds[episode])
+        for (move, shoot) in self.recording.inputs[episode]:
+            engine.handle_input(move, shoot)
+            engine.tick()
+            yield engine
+
+    def get_frames(self, episode: int = 0) -> Iterator[np.ndarray]:
+
+        for engine in self.replay(episode):
+            yield engine.get_play_area_image()
+
+    def get_sprite_data(self, episode: int = 0) -> Iterator[List[Tuple[int, int, str]]]:
+
+        for engine in self.replay(episode):
+            yield engine.get_sprite_data()
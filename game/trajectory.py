@@ -0,0 +1,264 @@
+import glob
+import json
+import os
+import queue
+import shutil
+import threading
+import zipfile
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Sequence
+import numpy as np
+from .game import INFO_KEYS
+
+
+def _get_index_path(directory: str, shard: int) -> str:
+
+    return os.path.join(directory, f'shard-{shard:03d}.json')
+
+
+class TrajectoryWriter:
+    """ Streams Environment.step transitions to disk in chunks of chunk_size rows.
+
+    Rows go into preallocated chunk buffers and full chunks are written by a background thread, so the step loop only
+    copies one observation per call and memory stays at a few chunks however long the run.  Chunks are npz files
+    deflated at compress_level, fast level 1 by default since frames compress well anyway; level 0 writes a directory
+    of npy files instead which the reader memory maps.  Workers writing into one directory each take their own shard;
+    the index of a shard is rewritten after every chunk, so a crashed run stays readable.
+    """
+
+    def __init__(self, directory: str, shard: int = 0, chunk_size: int = 4096, compress_level: int = 1,
+                 max_pending: int = 2):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.shard = shard
+        self.chunk_size = chunk_size
+        self.compress_level = compress_level
+
+        self.specs = None
+        self.buffers = None
+        self.count = 0
+        self.chunks: List[dict] = []
+        self.error = None
+        self.closed = False
+
+        self.queue = queue.Queue(max_pending)
+        self.thread = threading.Thread(target=self._run, name=f'TrajectoryWriter-{shard}', daemon=True)
+        self.thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def add(self, observation: np.ndarray, action: int, reward: float, done: bool, info: dict):
+
+        if self.buffers is None:
+            self._check()
+            if self.specs is None:
+                observation = np.asarray(observation)
+                self.specs = {'observation': (observation.shape, observation.dtype.str),
+                              'action': ((), np.dtype(np.int32).str),
+                              'reward': ((), np.dtype(np.float32).str),
+                              'done': ((), np.dtype(np.bool_).str)}
+                self.specs.update({key: ((), np.dtype(np.int64).str) for key in INFO_KEYS})
+            self.buffers = {key: np.empty((self.chunk_size,) + shape, dtype=dtype)
+                            for key, (shape, dtype) in self.specs.items()}
+
+        row = self.count
+        buffers = self.buffers
+        buffers['observation'][row] = observation
+        buffers['action'][row] = action
+        buffers['reward'][row] = reward
+        buffers['done'][row] = done
+        for key in INFO_KEYS:
+            buffers[key][row] = info[key]
+
+        self.count = row + 1
+        if self.count == self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        """ Hand the rows added so far to the writer thread as a (possibly short) chunk. """
+
+        self._check()
+        if self.count == 0:
+            return
+
+        chunk = {key: buffer[:self.count] for key, buffer in self.buffers.items()}
+        # The writer thread owns the buffers now, the next add() starts fresh ones.
+        self.buffers = None
+        self.count = 0
+        self.queue.put(chunk)
+
+    def close(self):
+
+        if self.closed:
+            return
+        try:
+            self.flush()
+        finally:
+            self.closed = True
+            self.queue.put(None)
+            self.thread.join()
+        if self.error is not None:
+            raise RuntimeError(f'Writing trajectory chunk failed: {self.error!r}') from self.error
+
+    def _check(self):
+
+        if self.error is not None:
+            raise RuntimeError(f'Writing trajectory chunk failed: {self.error!r}') from self.error
+        if self.closed:
+            raise RuntimeError('TrajectoryWriter is closed.')
+
+    def _run(self):
+
+        while True:
+            chunk = self.queue.get()
+            if chunk is None:
+                break
+            if self.error is not None:
+                continue
+            try:
+                self._write(chunk)
+            except Exception as exception:  # pylint: disable=broad-except
+                self.error = exception
+
+    def _write(self, chunk: Dict[str, np.ndarray]):
+
+        name = f'shard-{self.shard:03d}-{len(self.chunks):06d}'
+        path = os.path.join(self.directory, name)
+        temporary = f'{path}.{os.getpid()}.tmp'
+        if self.compress_level:
+            name += '.npz'
+            with zipfile.ZipFile(temporary, 'w', zipfile.ZIP_DEFLATED, compresslevel=self.compress_level) as archive:
+                for key, values in chunk.items():
+                    with archive.open(f'{key}.npy', 'w', force_zip64=True) as entry:
+                        np.lib.format.write_array(entry, values, allow_pickle=False)
+            os.replace(temporary, f'{path}.npz')
+        else:
+            os.makedirs(temporary)
+            for key, values in chunk.items():
+                np.save(os.path.join(temporary, f'{key}.npy'), values)
+            shutil.rmtree(path, ignore_errors=True)
+            os.replace(temporary, path)
+
+        self.chunks.append({'name': name, 'rows': len(chunk['done'])})
+        index = {'shard': self.shard, 'fields': self.specs, 'chunks': self.chunks}
+        index_path = _get_index_path(self.directory, self.shard)
+        with open(f'{index_path}.tmp', 'w') as f:
+            json.dump(index, f)
+        os.replace(f'{index_path}.tmp', index_path)
+
+
+class TrajectoryReader:
+    """ Random access to the transitions of every shard in a directory written by TrajectoryWriter.
+
+    Rows are numbered shard by shard, chunk by chunk.  Loaded chunks are kept in a small LRU cache and reading a chunk
+    starts loading the next prefetch chunks in the background, so sequential passes rarely wait on decompression.
+    """
+
+    def __init__(self, directory: str, shards: Sequence[int] = None, cache_size: int = 8, prefetch: int = 2):
+        self.directory = directory
+        self.cache_size = max(cache_size, prefetch + 1)
+        self.prefetch = prefetch
+
+        paths = sorted(glob.glob(os.path.join(directory, 'shard-[0-9][0-9][0-9].json')))
+        if shards is not None:
+            paths = [_get_index_path(directory, shard) for shard in shards]
+        if not paths:
+            raise FileNotFoundError(f'No trajectory shards in {directory}.')
+
+        self.fields = None
+        self.chunks: List[str] = []
+        rows = []
+        for path in paths:
+            with open(path) as f:
+                index = json.load(f)
+            self.fields = self.fields or index['fields']
+            if index['fields'] != self.fields:
+                raise ValueError(f'Shard {path} holds different fields than the other shards.')
+            for chunk in index['chunks']:
+                self.chunks.append(os.path.join(directory, chunk['name']))
+                rows.append(chunk['rows'])
+
+        # ends[i] is the first row after chunk i.
+        self.ends = np.cumsum(rows, dtype=np.int64)
+        self.cache: 'OrderedDict[int, Future]' = OrderedDict()
+        self.executor = ThreadPoolExecutor(max(prefetch, 1), thread_name_prefix='TrajectoryReader')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+
+        return int(self.ends[-1]) if len(self.ends) else 0
+
+    def __getitem__(self, index: int) -> Dict[str, np.ndarray]:
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(f'Transition {index} out of range.')
+        chunk = int(np.searchsorted(self.ends, index, side='right'))
+        row = index - (int(self.ends[chunk - 1]) if chunk else 0)
+        return {key: values[row] for key, values in self.get_chunk(chunk).items()}
+
+    def get_batch(self, indices: Sequence[int]) -> Dict[str, np.ndarray]:
+        """ Transitions at indices stacked per field, reading every chunk involved once. """
+
+        indices = np.asarray(indices, dtype=np.int64)
+        if len(indices) and (indices.min() < 0 or indices.max() >= len(self)):
+            raise IndexError('Transition indices out of range.')
+
+        batch = {key: np.empty((len(indices),) + tuple(shape), dtype=dtype)
+                 for key, (shape, dtype) in self.fields.items()}
+        chunks = np.searchsorted(self.ends, indices, side='right')
+        starts = np.concatenate([[0], self.ends[:-1]])
+        for chunk in np.unique(chunks).tolist():
+            selected = np.flatnonzero(chunks == chunk)
+            rows = indices[selected] - starts[chunk]
+            for key, values in self.get_chunk(chunk).items():
+                batch[key][selected] = values[rows]
+        return batch
+
+    def get_chunk(self, chunk: int) -> Dict[str, np.ndarray]:
+
+        future = self._load(chunk)
+        for ahead in range(chunk + 1, min(chunk + 1 + self.prefetch, len(self.chunks))):
+            self._load(ahead)
+        return future.result()
+
+    def iterate_chunks(self):
+        """ Yield every chunk in order, the fastest way to make a full pass. """
+
+        for chunk in range(len(self.chunks)):
+            yield self.get_chunk(chunk)
+
+    def close(self):
+
+        self.executor.shutdown(wait=True)
+        self.cache.clear()
+
+    def _load(self, chunk: int) -> Future:
+
+        future = self.cache.get(chunk)
+        if future is None:
+            future = self.executor.submit(self._read, self.chunks[chunk])
+            self.cache[chunk] = future
+            while len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        else:
+            self.cache.move_to_end(chunk)
+        return future
+
+    def _read(self, path: str) -> Dict[str, np.ndarray]:
+
+        if path.endswith('.npz'):
+            with np.load(path) as data:
+                return {key: data[key] for key in self.fields}
+        return {key: np.load(os.path.join(path, f'{key}.npy'), mmap_mode='r') for key in self.fields}
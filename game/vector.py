@@ -0,0 +1,219 @@
+import multiprocessing
+import os
+import traceback
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, List, Sequence, Tuple, Union
+import numpy as np
+import gym
+from .game import INFO_KEYS, Environment
+from .engine.entities import SPRITE_TYPE_IDS
+from .engine.graphics import load_atlas
+
+
+def _create_buffers(specs: Dict[str, Tuple[tuple, str]], names: Dict[str, str] = None):
+
+    blocks = {}
+    arrays = {}
+    for key, (shape, dtype) in specs.items():
+        size = max(int(np.prod(shape)) * np.dtype(dtype).itemsize, 1)
+        if names is None:
+            block = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            block = shared_memory.SharedMemory(name=names[key])
+        blocks[key] = block
+        arrays[key] = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+    return blocks, arrays
+
+
+def _worker(index: int, pipe, env_kwargs: dict, cpus: Sequence[int]):
+
+    if cpus is not None and hasattr(os, 'sched_setaffinity'):
+        os.sched_setaffinity(0, cpus)
+
+    try:
+        env = Environment(**env_kwargs)
+        pipe.send((True, (env.observation_space, env.action_space)))
+
+        specs, names = pipe.recv()
+        blocks, arrays = _create_buffers(specs, names)
+        observations = arrays['observations']
+        sprites = arrays['sprites']
+        max_sprites = sprites.shape[1]
+
+        def write(reward, done, info):
+            arrays['rewards'][index] = reward
+            arrays['dones'][index] = done
+            arrays['infos'][index] = [info[key] for key in INFO_KEYS]
+
+            data = info['data'][:max_sprites]
+            sprites[index] = 0
+            for row, (x, y, name) in enumerate(data):
+                sprites[index, row] = (x, y, SPRITE_TYPE_IDS[name])
+            arrays['sprite_counts'][index] = len(data)
+
+        while True:
+            (command, payload) = pipe.recv()
+            if command == 'step':
+                _, reward, done, info = env.step(int(arrays['actions'][index]), out=observations[index])
+                if done:
+                    env.reset(out=observations[index])
+                write(reward, done, info)
+            elif command == 'reset':
+                env.reset(out=observations[index], seed=payload)
+                write(0, False, env.get_info())
+            elif command == 'close':
+                break
+            pipe.send((True, None))
+    except (KeyboardInterrupt, EOFError):
+        pass
+    except Exception:  # pylint: disable=broad-except
+        pipe.send((False, traceback.format_exc()))
+    finally:
+        pipe.close()
+
+
+class VectorEnvironment:
+    """ Runs num_envs Environments in worker processes.
+
+    Observations, rewards, dones, info values and sprite data are written by the workers into shared memory, only
+    small control messages travel over the pipes.  Environments are reset automatically when done, the observation
+    returned for that step is the first one of the next episode.
+
+    cpus pins the workers: True pins worker i to cpu i, or pass one cpu set per worker.  When copy is False, step and
+    reset return views of the shared buffers which are overwritten by the next call.
+    """
+
+    def __init__(self,
+                 num_envs: int,
+                 max_sprites: int = 256,
+                 cpus: Union[bool, List[Sequence[int]]] = None,
+                 copy: bool = True,
+                 start_method: str = None,
+                 **env_kwargs):
+        self.num_envs = num_envs
+        self.copy = copy
+        self.closed = False
+
+        if cpus is True:
+            cpus = [[i % os.cpu_count()] for i in range(num_envs)]
+
+        # Workers must share our resource tracker, otherwise each of them unlinks the buffers when it exits.
+        resource_tracker.ensure_running()
+        # Build the sprite atlas cache once up front, workers then map the same read-only pixels.
+        load_atlas()
+        context = multiprocessing.get_context(start_method)
+        self.pipes = []
+        self.processes = []
+        for index in range(num_envs):
+            parent_pipe, child_pipe = context.Pipe()
+            process = context.Process(target=_worker, daemon=True,
+                                      args=(index, child_pipe, env_kwargs, cpus[index] if cpus else None))
+            process.start()
+            child_pipe.close()
+            self.pipes.append(parent_pipe)
+            self.processes.append(process)
+
+        (self.single_observation_space, self.single_action_space) = self._receive()[0]
+        self.observation_space = gym.vector.utils.batch_space(self.single_observation_space, num_envs)
+        self.action_space = gym.spaces.MultiDiscrete([self.single_action_space.n] * num_envs)
+
+        specs = {
+            'observations': ((num_envs,) + self.single_observation_space.shape,
+                             self.single_observation_space.dtype.str),
+            'actions': ((num_envs,), np.int64),
+            'rewards': ((num_envs,), np.float32),
+            'dones': ((num_envs,), np.bool_),
+            'infos': ((num_envs, len(INFO_KEYS)), np.int64),
+            'sprites': ((num_envs, max_sprites, 3), np.int32),
+            'sprite_counts': ((num_envs,), np.int32),
+        }
+        self.blocks, self.arrays = _create_buffers(specs)
+        names = {key: block.name for key, block in self.blocks.items()}
+        for pipe in self.pipes:
+            pipe.send((specs, names))
+
+    def _receive(self) -> list:
+
+        results = []
+        errors = []
+        for index, pipe in enumerate(self.pipes):
+            (success, payload) = pipe.recv()
+            if success:
+                results.append(payload)
+            else:
+                errors.append(f'Worker {index}:\n{payload}')
+
+        if errors:
+            self.close()
+            raise RuntimeError('\n'.join(errors))
+
+        return results
+
+    def _send(self, command: str, payloads: Sequence = None):
+
+        if self.closed:
+            raise RuntimeError('VectorEnvironment is closed.')
+
+        for index, pipe in enumerate(self.pipes):
+            pipe.send((command, payloads[index] if payloads is not None else None))
+        self._receive()
+
+    def _get(self, key: str) -> np.ndarray:
+
+        return self.arrays[key].copy() if self.copy else self.arrays[key]
+
+    def get_infos(self) -> dict:
+        """ Info values for every environment, sprite data as (x, y, type id) rows padded with zeros. """
+
+        infos = {key: self.arrays['infos'][:, i].copy() for i, key in enumerate(INFO_KEYS)}
+        infos['data'] = self._get('sprites')
+        infos['data_counts'] = self._get('sprite_counts')
+        return infos
+
+    def reset(self, seed: int = None) -> np.ndarray:
+        """ Reset every environment, environment i is seeded with seed + i when seed is given. """
+
+        self._send('reset', [seed + index for index in range(self.num_envs)] if seed is not None else None)
+        return self._get('observations')
+
+    def step(self, actions: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, dict]:
+
+        actions = np.asarray(actions)
+        if actions.shape != (self.num_envs,):
+            raise ValueError(f'Expected {self.num_envs} actions, got shape {actions.shape}.')
+
+        self.arrays['actions'][:] = actions
+        self._send('step')
+        return self._get('observations'), self._get('rewards'), self._get('dones'), self.get_infos()
+
+    def close(self):
+
+        if self.closed:
+            return
+        self.closed = True
+
+        for pipe in self.pipes:
+            try:
+                pipe.send(('close', None))
+            except (BrokenPipeError, OSError):
+                pass
+        for process in self.processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        for pipe in self.pipes:
+            pipe.close()
+
+        self.arrays = {}
+        for block in getattr(self, 'blocks', {}).values():
+            try:
+                block.close()
+            except BufferError:
+                pass  # Views handed out with copy=False are still alive, the mapping goes with them.
+            block.unlink()
+
+    def __del__(self):
+
+        if not getattr(self, 'closed', True):
+            self.close()
@@ -155,10 +155,11 @@ class Input():
         )
 
 
-def main(level: int = 1, lives: int = 3000, fps: int = 30, godmode: bool = False):
+def main(level: int = 1, lives: int = 3000, fps: int = 30, godmode: bool = False, record: str = None):
 
     env = Environment(level=level, lives=lives, fps=fps, godmode=godmode, headless=False)
     user_input = Input()
+    recording = env.record() if record else None
 
     env.reset()
     try:
@@ -177,6 +178,11 @@ def main(level: int = 1, lives: int = 3000, fps: int = 30, godmode: bool = False
     except KeyboardInterrupt:
         print("Interrupt detected.  Exiting...")
 
+    finally:
+        if recording is not None:
+            recording.save(record)
+            print(f"Saved {len(recording)} episode(s) to {record}")
+
 
 
 if __name__ == "__main__":
@@ -185,6 +191,7 @@ if __name__ == "__main__":
     parser.add_argument('--lives', type=int, default=3, help='Lives')
     parser.add_argument('--fps', type=int, default=30, help='FPS')
     parser.add_argument('--godmode', action='store_true', help='Enable GOD Mode (Can\'t die.)')
+    parser.add_argument('--record', type=str, default=None, help='Save the seeds and inputs of the session to this file')
 
     args = parser.parse_args()
-    main(args.level, args.lives, args.fps, args.godmode)
+    main(args.level, args.lives, args.fps, args.godmode, args.record)
@@ -0,0 +1,7 @@
+import os
+import tempfile
+
+# Keep the sprite atlas cache of test runs out of the home directory.  This runs before any test imports game, which
+# resolves ROBOTRON_CACHE_DIR on import.
+_cache_dir = tempfile.TemporaryDirectory(prefix='robotron-tests-')
+os.environ['ROBOTRON_CACHE_DIR'] = _cache_dir.name
@@ -0,0 +1,46 @@
+from collections import Counter
+import numpy as np
+from game import BatchEnvironment
+from game.engine import BatchEngine, Engine
+from game.engine.entities import SPRITE_TYPE_IDS
+
+# The sprites BatchEngine simulates, besides the player and bullets.
+COVERED = {SPRITE_TYPE_IDS[name] for name in ['Grunt', 'Electrode', 'Hulk', 'Mommy', 'Daddy', 'Mikey']}
+
+
+def play(seed, steps=100):
+
+    env = BatchEnvironment(8, seed=seed)
+    results = [env.reset(seed=seed)]
+    generator = np.random.default_rng(seed)
+    for _ in range(steps):
+        results.extend(env.step(generator.integers(81, size=8))[:3])
+    return env, results
+
+
+def test_seeded_batches_repeat():
+
+    (_, first) = play(1)
+    (_, second) = play(1)
+    (_, other) = play(2)
+    assert all(np.array_equal(a, b) for a, b in zip(first, second))
+    assert not all(np.array_equal(a, b) for a, b in zip(first, other))
+
+
+def test_sprites_stay_on_the_board():
+
+    (env, _) = play(3, steps=300)
+    engine = env.engine
+    live = engine.kind > 0
+    assert ((engine.x[live] >= engine.left) & (engine.x[live] + engine.width[live] <= engine.right)).all()
+    assert ((engine.y[live] >= engine.top) & (engine.y[live] + engine.height[live] <= engine.bottom)).all()
+
+
+def test_waves_start_like_engine_waves():
+
+    for level in [1, 2, 5]:
+        batch = BatchEngine(1, start_level=level, seed=0)
+        engine = Engine(start_level=level, headless=True, render_policy='never', seed=0, turbo=True)
+        expected = Counter(SPRITE_TYPE_IDS[sprite.__class__.__name__] for sprite in engine.all_group
+                           if SPRITE_TYPE_IDS.get(sprite.__class__.__name__) in COVERED)
+        assert Counter(kind for kind in batch.kind[0].tolist() if kind) == expected
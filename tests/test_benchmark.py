@@ -0,0 +1,22 @@
+import copy
+import json
+from game.benchmark import compare, BASELINE_PATH
+
+
+def test_compare_uses_the_tail_tolerance_for_p99s():
+
+    with open(BASELINE_PATH) as f:
+        baseline = json.load(f)
+    current = copy.deepcopy(baseline)
+    assert compare(current, baseline) == []
+
+    result = current['results'][0]
+    result['step_p99_ms'] *= 1.4
+    result['reset_p50_ms'] *= 1.4
+    assert compare(current, baseline) == []
+
+    result['step_p50_ms'] *= 1.2
+    result['steps_per_sec'] /= 1.2
+    result['step_p99_ms'] *= 1.2
+    regressions = compare(current, baseline)
+    assert [line.split(': ')[1].split()[0] for line in regressions] == ['steps_per_sec', 'step_p50_ms', 'step_p99_ms']
@@ -0,0 +1,43 @@
+import numpy as np
+import pygame
+import pytest
+from game.engine import Engine
+
+
+def spritecollide_enemies(self, sprite):
+    """ Engine._collide_enemies as the game shipped it, testing every enemy rect from Python. """
+
+    return pygame.sprite.spritecollide(sprite, self.enemy_group, False)
+
+
+def spritecollide_family(self, sprite):
+
+    return pygame.sprite.spritecollide(sprite, self.family_group, False)
+
+
+def play(level, ticks=500, seed=4):
+
+    engine = Engine(start_level=level, headless=True, render_policy='never', seed=seed, turbo=True)
+    inputs = np.random.default_rng(seed)
+    frames = []
+    for _ in range(ticks):
+        engine.handle_input(int(inputs.integers(9)), int(inputs.integers(9)))
+        engine.tick()
+        frames.append((engine.score, engine.lives, engine.level, engine.family_remaining(),
+                       [(sprite.entity_id, tuple(sprite.rect)) for sprite in engine.all_group]))
+    return frames
+
+
+@pytest.mark.parametrize('level', [1, 5, 9])
+def test_queries_match_spritecollide(monkeypatch, level):
+
+    frames = play(level)
+    monkeypatch.setattr(Engine, '_collide_enemies', spritecollide_enemies)
+    monkeypatch.setattr(Engine, '_collide_family', spritecollide_family)
+    expected = play(level)
+
+    assert frames == expected
+    # Bullets hit enemies, the player dies or clears the wave, and family members are rescued or trampled.
+    assert frames[-1][0] > 0
+    assert frames[-1][1] < frames[0][1] or frames[-1][2] > frames[0][2]
+    assert frames[-1][3] < frames[0][3]
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+from game.engine import Engine
+from game.engine.entities import Electrode
+
+
+def scan_update(self):
+    """ Electrode.update as the game shipped it, scanning the whole enemy group on every update. """
+
+    if self.alive:
+        if any(self.rect.colliderect(sprite.rect)
+               for sprite in self.engine._get_enemy_group() if self != sprite):
+            self.alive = False
+    else:
+        self.animation_step += 1
+        if self.animation_step >= len(self.animations):
+            self.kill()
+        else:
+            self.image = self.animations[self.animation_step]
+
+
+def play(level, shoot, ticks=400, seed=3):
+
+    engine = Engine(start_level=level, headless=True, render_policy='never', seed=seed, turbo=True)
+    inputs = np.random.default_rng(seed)
+    frames = []
+    for _ in range(ticks):
+        engine.handle_input(int(inputs.integers(9)), int(inputs.integers(9)) if shoot else 0)
+        engine.tick()
+        frames.append((engine.score, engine.lives, engine.level,
+                       [(sprite.entity_id, tuple(sprite.rect), sprite.alive if isinstance(sprite, Electrode) else None)
+                        for sprite in engine.all_group]))
+    return frames
+
+
+@pytest.mark.parametrize('level', [2, 3, 4])
+@pytest.mark.parametrize('shoot', [False, True])
+def test_contacts_match_group_scan(monkeypatch, level, shoot):
+
+    frames = play(level, shoot)
+    monkeypatch.setattr(Electrode, 'update', scan_update)
+    expected = play(level, shoot)
+
+    assert frames == expected
+    # Without shooting only contacts kill electrodes, make sure some did.
+    alive = [[state for (_, _, state) in sprites if state is not None] for (_, _, _, sprites) in frames]
+    assert sum(alive[-1]) < len(alive[0])
@@ -0,0 +1,48 @@
+import numpy as np
+from game import Environment
+from game.engine import Engine
+from game.engine.entities import Electrode, Sphereoid
+
+ALIVE = Engine.ENTITY_FEATURES.index('alive')
+ID = Engine.ENTITY_FEATURES.index('id')
+
+
+def get_alive(engine):
+
+    data = engine.get_entity_data(np.zeros((256, len(Engine.ENTITY_FEATURES)), dtype=np.float32))
+    return {int(row[ID]): int(row[ALIVE]) for row in data if row[ID]}
+
+
+def test_alive_follows_sprite_state():
+
+    engine = Engine(start_level=2, headless=True, render_policy='never', seed=1, turbo=True)
+    electrode = next(sprite for sprite in engine.all_group if isinstance(sprite, Electrode))
+    sphereoid = next(sprite for sprite in engine.all_group if isinstance(sprite, Sphereoid))
+
+    alive = get_alive(engine)
+    assert set(alive.values()) == {1}
+
+    electrode.die(None)
+    sphereoid.die(None)
+    alive = get_alive(engine)
+    assert alive[electrode.entity_id] == 0
+    assert alive[sphereoid.entity_id] == 0
+    assert alive[engine.player.entity_id] == 1
+    assert sum(alive.values()) == len(alive) - 2
+
+
+def test_no_velocity_across_a_death():
+
+    env = Environment(level=1, seed=1, frame_skip=4, observation_type='entities', render_policy='never')
+    env.reset()
+    generator = np.random.default_rng(0)
+    (lives, deaths) = (env.engine.lives, 0)
+    while deaths < 2:
+        (state, _, done, info) = env.step(int(generator.integers(env.action_space.n)))
+        if info['lives'] < lives or done:
+            assert not state[:, 3:5].any()
+            (lives, deaths) = (info['lives'], deaths + 1)
+        if done:
+            break
+
+    assert deaths == 2
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+from game import Environment
+
+
+@pytest.mark.parametrize('reuse_observation', [False, True])
+def test_pooling_leaves_the_frame_alone(reuse_observation):
+
+    env = Environment(level=3, seed=1, frame_skip=4, reuse_observation=reuse_observation)
+    env.reset()
+    for action in [10, 20, 30, 40, 50]:
+        (state, _, _, _) = env.step(action)
+        frame = env.engine.get_play_area_image()
+
+        assert np.array_equal(state, np.maximum(frame, env.pool))
+        assert np.array_equal(env.get_pixels(), frame)
+        assert np.array_equal(env.render('rgb_array'), frame)
+        assert not np.shares_memory(state, env.get_pixels())
+
+    out = np.zeros_like(state)
+    assert env.step(60, out=out)[0] is out
+    assert np.array_equal(env.get_pixels(), env.engine.get_play_area_image())
+
+
+def test_no_pooling_across_a_death():
+
+    env = Environment(level=5, seed=2, frame_skip=2)
+    env.reset()
+    generator = np.random.default_rng(0)
+    (lives, deaths) = (env.engine.lives, 0)
+    while deaths < 4:
+        (state, _, done, info) = env.step(int(generator.integers(env.action_space.n)))
+        if info['lives'] < lives or done:
+            assert np.array_equal(state, env.engine.get_play_area_image())
+            (lives, deaths) = (info['lives'], deaths + 1)
+        if done:
+            break
+
+    assert deaths > 1
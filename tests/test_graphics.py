@@ -0,0 +1,57 @@
+import shutil
+import numpy as np
+import pygame
+from game.engine import graphics
+
+
+def count_decodes(monkeypatch):
+
+    decodes = []
+    load = pygame.image.load
+
+    def counted_load(*args, **kwargs):
+        decodes.append(args[0])
+        return load(*args, **kwargs)
+
+    monkeypatch.setattr(pygame.image, 'load', counted_load)
+    return decodes
+
+
+def test_second_load_skips_decoding(monkeypatch, tmp_path):
+
+    decodes = count_decodes(monkeypatch)
+    monkeypatch.setattr(graphics, '_atlases', {})
+    (pixels, index) = graphics.load_atlas(cache_dir=str(tmp_path))
+    assert len(decodes) == 1
+    assert len(list(tmp_path.glob('atlas-*.npy'))) == 1
+
+    # A new process only has the files in the cache directory.
+    monkeypatch.setattr(graphics, '_atlases', {})
+    (cached_pixels, cached_index) = graphics.load_atlas(cache_dir=str(tmp_path))
+    assert len(decodes) == 1
+    assert isinstance(cached_pixels, np.memmap)
+    assert np.array_equal(cached_pixels, pixels)
+    assert cached_index == index
+
+
+def test_changed_resource_invalidates_the_cache(monkeypatch, tmp_path):
+
+    resources = tmp_path / 'resources'
+    resources.mkdir()
+    paths = tuple(str(shutil.copy(resource, resources)) for resource in graphics._get_resource_paths())
+    monkeypatch.setattr(graphics, '_get_resource_paths', lambda: paths)
+    decodes = count_decodes(monkeypatch)
+    cache_dir = str(tmp_path / 'cache')
+
+    graphics.load_atlas(cache_dir=cache_dir)
+    key = graphics._get_atlas_key(paths)
+    graphics.load_atlas(cache_dir=cache_dir)
+    assert len(decodes) == 1
+
+    # Bytes after the end of the JPEG change its hash but not the decoded image.
+    with open(paths[0], 'ab') as spritesheet:
+        spritesheet.write(b'\0')
+    assert graphics._get_atlas_key(paths) != key
+    graphics.load_atlas(cache_dir=cache_dir)
+    assert len(decodes) == 2
+    assert len(list((tmp_path / 'cache').glob('atlas-*.npy'))) == 2
@@ -0,0 +1,71 @@
+import random
+import pygame
+from game.engine import Engine
+from game.engine.entities import Grunt
+from game.engine.placement import Placement
+
+
+def test_killed_sprites_release_their_cells():
+
+    engine = Engine(start_level=5, headless=True, render_policy='never', seed=1, turbo=True)
+    placement = engine.placement
+    grunts = [sprite for sprite in engine.all_group if isinstance(sprite, Grunt)]
+    occupied = placement.occupied.sum()
+
+    for grunt in grunts:
+        assert grunt in placement.windows
+        grunt.die(None)
+
+    assert not any(grunt in placement.windows for grunt in grunts)
+    assert placement.occupied.sum() < occupied
+    assert placement.occupied.min() == 0
+
+
+def test_placement_matches_board_after_death():
+
+    engine = Engine(start_level=5, headless=True, render_policy='never', seed=1, turbo=True)
+    for grunt in [sprite for sprite in engine.all_group if isinstance(sprite, Grunt)][:10]:
+        grunt.die(None)
+    # Run into the remaining enemies until a life is lost, which places every sprite again.
+    lives = engine.lives
+    while engine.lives == lives and not engine.done:
+        engine.tick()
+
+    assert set(engine.placement.windows) <= set(engine.all_group)
+
+
+def place(one_by_one, monkeypatch):
+
+    play_rect = pygame.Rect(20, 40, 400, 300)
+    placement = Placement(play_rect, random.Random(5))
+    searches = []
+    free_windows = placement._free_windows
+    monkeypatch.setattr(placement, '_free_windows', lambda *args: searches.append(args) or free_windows(*args))
+
+    # Leave a third of the board free, so many sprites miss their random tries.
+    placement.reset([], [pygame.Rect(20, 40, 400, 200)])
+    sprites = [pygame.sprite.Sprite() for _ in range(60)]
+    for (index, sprite) in enumerate(sprites):
+        sprite.rect = pygame.Rect(0, 0, [10, 16, 24][index % 3], [12, 20][index % 2])
+
+    if one_by_one:
+        for sprite in sprites:
+            placement.place(sprite)
+    else:
+        placement.defer()
+        for sprite in sprites:
+            placement.place(sprite)
+        assert all(sprite.rect.topleft == (0, 0) for sprite in sprites)
+        placement.place_all()
+    return [tuple(sprite.rect) for sprite in sprites], placement.occupied.copy(), len(searches)
+
+
+def test_place_all_matches_placing_one_by_one(monkeypatch):
+
+    (rects, occupied, searches) = place(True, monkeypatch)
+    (batch_rects, batch_occupied, batch_searches) = place(False, monkeypatch)
+
+    assert batch_rects == rects
+    assert (batch_occupied == occupied).all()
+    # One search for free windows per sprite size instead of one per missed placement.
+    assert batch_searches <= 6 < searches
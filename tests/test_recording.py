@@ -0,0 +1,44 @@
+import random
+import pytest
+from game import Environment, Recording, Replayer
+
+
+def test_replay_matches_the_recorded_games(tmp_path):
+
+    env = Environment(level=3, frame_skip=1)
+    recording = env.record()
+    live = []
+    for episode in range(2):
+        env.reset(seed=None if episode else 7)
+        actions = random.Random(episode)
+        for _ in range(200):
+            (_, _, done, _) = env.step(actions.randrange(81))
+            live.append(env.engine.get_sprite_data())
+            if done:
+                break
+    assert env.stop_recording() is recording
+    assert recording.seeds[0] == 7 and len(recording) == 2
+
+    path = str(tmp_path / 'games.npz')
+    recording.save(path)
+    loaded = Recording.load(path)
+    assert (loaded.seeds, loaded.inputs) == (recording.seeds, recording.inputs)
+
+    replayer = Replayer(loaded)
+    replayed = [data for episode in range(len(loaded)) for data in replayer.get_sprite_data(episode)]
+    assert replayed == live
+
+
+def test_empty_recording_round_trip(tmp_path):
+
+    path = str(tmp_path / 'empty.npz')
+    Recording(level=2).save(path)
+    loaded = Recording.load(path)
+    assert len(loaded) == 0 and loaded.level == 2
+
+
+def test_replayer_rejects_other_configs(tmp_path):
+
+    recording = Recording(config_hash='not the config')
+    with pytest.raises(ValueError):
+        Replayer(recording)
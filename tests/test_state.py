@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+from game import Environment
+
+
+def run(env, actions):
+
+    frames = []
+    for action in actions:
+        (state, reward, done, info) = env.step(action)
+        frames.append((state.copy(), reward, done, info))
+        if done:
+            break
+    return frames
+
+
+def assert_same(frames, expected):
+
+    assert len(frames) == len(expected)
+    for (state, *rest), (expected_state, *expected_rest) in zip(frames, expected):
+        assert np.array_equal(state, expected_state)
+        assert rest == expected_rest
+
+
+@pytest.mark.parametrize('level', [1, 5, 12])
+def test_restore_replays_the_same_future(level):
+
+    env = Environment(level=level, seed=3)
+    env.reset()
+    generator = np.random.default_rng(level)
+    run(env, generator.integers(81, size=60).tolist())
+
+    state = env.clone_state()
+    observation = env.get_pixels().copy()
+    actions = generator.integers(81, size=150).tolist()
+    expected = run(env, actions)
+
+    # Wander off somewhere else before going back, more than once.
+    for _ in range(2):
+        env.restore_state(state)
+        run(env, generator.integers(81, size=40).tolist())
+        assert np.array_equal(env.restore_state(state), observation)
+        assert_same(run(env, actions), expected)
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+from game import Environment, TrajectoryWriter, TrajectoryReader
+
+
+def test_round_trip(tmp_path):
+
+    directory = str(tmp_path)
+    env = Environment(level=1, seed=3, render_size=(80, 60))
+    env.reset()
+    generator = np.random.default_rng(0)
+    written = []
+    for shard, compress_level in [(0, 1), (1, 0)]:
+        with TrajectoryWriter(directory, shard=shard, chunk_size=64, compress_level=compress_level) as writer:
+            for _ in range(150):
+                action = int(generator.integers(81))
+                (observation, reward, done, info) = env.step(action)
+                writer.add(observation, action, reward, done, info)
+                written.append((observation.copy(), action, reward, done, info['score']))
+                if done:
+                    env.reset()
+
+    with TrajectoryReader(directory) as reader:
+        assert len(reader) == len(written)
+        for index in [0, 63, 64, 149, 150, 299, -1]:
+            row = reader[index]
+            (observation, action, reward, done, score) = written[index]
+            assert np.array_equal(row['observation'], observation)
+            assert (row['action'], row['done'], row['score']) == (action, done, score)
+            assert row['reward'] == np.float32(reward)
+
+        indices = generator.integers(len(written), size=100)
+        batch = reader.get_batch(indices)
+        assert np.array_equal(batch['observation'], np.stack([written[index][0] for index in indices]))
+        assert sum(len(chunk['done']) for chunk in reader.iterate_chunks()) == len(written)
+        with pytest.raises(IndexError):
+            reader[len(written)]
+
+    with TrajectoryReader(directory, shards=[1]) as reader:
+        assert len(reader) == 150
+        assert reader[0]['action'] == written[150][1]
@@ -0,0 +1,18 @@
+import numpy as np
+from game import Environment
+
+
+def test_turbo_plays_the_same_frames():
+
+    (turbo, headless) = (Environment(level=5, seed=5, turbo=True), Environment(level=5, seed=5))
+    assert turbo.engine.clock is None and turbo.engine.font is None
+    assert np.array_equal(turbo.reset(), headless.reset())
+
+    generator = np.random.default_rng(1)
+    for action in generator.integers(81, size=200).tolist():
+        (state, reward, done, info) = turbo.step(action)
+        (expected_state, *expected) = headless.step(action)
+        assert np.array_equal(state, expected_state)
+        assert [reward, done, info] == expected
+        if done:
+            break
@@ -0,0 +1,28 @@
+import numpy as np
+from game import Environment, VectorEnvironment
+
+
+def test_workers_play_like_single_environments():
+
+    kwargs = {'level': 2, 'render_size': (80, 60), 'frame_skip': 2}
+    vector = VectorEnvironment(2, **kwargs)
+    singles = [Environment(**kwargs) for _ in range(2)]
+    try:
+        observations = vector.reset(seed=5)
+        for index, env in enumerate(singles):
+            assert np.array_equal(observations[index], env.reset(seed=5 + index))
+
+        generator = np.random.default_rng(0)
+        for _ in range(100):
+            actions = generator.integers(81, size=2)
+            (observations, rewards, dones, infos) = vector.step(actions)
+            for index, env in enumerate(singles):
+                (observation, reward, done, info) = env.step(int(actions[index]))
+                if done:
+                    observation = env.reset()
+                assert np.array_equal(observations[index], observation)
+                assert (rewards[index], dones[index]) == (np.float32(reward), done)
+                assert infos['score'][index] == info['score']
+                assert infos['data_counts'][index] == len(info['data'])
+    finally:
+        vector.close()